@@ -0,0 +1,132 @@
+import argparse
+import os
+import random
+import resource
+import time
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "0:benchmark")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_URL", "http://vera.invalid/check")
+
+from benchmarks.bench_pipeline import percentile
+from services.claim_index import ClaimIndex
+from services.fact_check_cache import normalize_query
+
+SYLLABLES = ["ba", "ché", "di", "fo", "gu", "la", "mé", "no", "pi", "ro", "sa", "té", "vu", "zi", "an", "on", "ir", "eur", "ou", "ais"]
+FILLERS = ["le", "la", "les", "de", "du", "des", "un", "une", "en", "dans", "sur", "a", "est", "sont"]
+EMOJI = ["🚨", "😱", "‼️", "👉", "🔥"]
+
+def make_vocabulary(rng: random.Random, size: int) -> list[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+def make_claim(rng: random.Random, vocabulary: list[str]) -> str:
+    words = []
+    for _ in range(rng.randint(5, 10)):
+        words.append(rng.choice(FILLERS))
+        words.append(rng.choice(vocabulary))
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), str(rng.randint(2, 2030)))
+    words[0] = words[0].capitalize()
+    return " ".join(words) + "."
+
+def paraphrase(rng: random.Random, claim: str) -> str:
+    words = claim.rstrip(".").split()
+    variant = rng.randrange(5)
+    if variant == 0:
+        cut = rng.randrange(2, len(words) - 1)
+        words = words[cut:] + [","] + words[:cut]
+    elif variant == 1:
+        words = [word.lower() for word in words] + ["!!!"]
+    elif variant == 2:
+        words = [rng.choice(EMOJI)] + words + [rng.choice(EMOJI)]
+    elif variant == 3:
+        words = ["Apparemment", ","] + [rng.choice(FILLERS) if word in FILLERS else word for word in words]
+    else:
+        words = [word + "s" if len(word) > 3 and rng.random() < 0.3 else word for word in words]
+    return " ".join(words) + "."
+
+def swap_roles(rng: random.Random, claim: str) -> str:
+    words = claim.rstrip(".").split()
+    content = [index for index, word in enumerate(words) if word.lower() not in FILLERS and not word.isdigit()]
+    first, second = rng.sample(content, 2)
+    words[first], words[second] = words[second], words[first]
+    return " ".join(words) + "."
+
+def mutate(rng: random.Random, claim: str, vocabulary: list[str]) -> str:
+    words = claim.rstrip(".").split()
+    content = [index for index, word in enumerate(words) if word.lower() not in FILLERS and not word.isdigit()]
+    variant = rng.randrange(4)
+    if variant == 0:
+        return claim.rstrip(".") + f" {rng.randint(2, 2030)}."
+    if variant == 1:
+        position = rng.randrange(1, len(words))
+        return " ".join(words[:position] + ["ne", "pas"] + words[position:]) + "."
+    if variant == 2:
+        return swap_roles(rng, claim)
+    for index in rng.sample(content, 2):
+        words[index] = rng.choice(vocabulary)
+    return " ".join(words) + "."
+
+def timed_lookups(index: ClaimIndex, queries: list[str]) -> tuple[int, list[float]]:
+    hits = 0
+    durations = []
+    for query in queries:
+        start = time.perf_counter()
+        match = index.find(query)
+        durations.append(time.perf_counter() - start)
+        hits += match is not None
+    return hits, durations
+
+def main():
+    parser = argparse.ArgumentParser(description="Index d'affirmations proches: latence, mémoire et précision")
+    parser.add_argument("--claims", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--max-distance", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng, args.vocabulary)
+    
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    index = ClaimIndex(max_entries=args.claims, ttl_seconds=24 * 3600, max_distance=args.max_distance)
+    sample: list[str] = []
+    
+    start = time.perf_counter()
+    for position in range(args.claims):
+        claim = make_claim(rng, vocabulary)
+        index.add(claim, normalize_query(claim))
+        if len(sample) < args.queries:
+            sample.append(claim)
+        elif rng.random() < args.queries / (position + 1):
+            sample[rng.randrange(args.queries)] = claim
+    insert_time = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    index.hits = index.misses = index.candidates = 0
+    scenarios = [
+        ("paraphrases", [paraphrase(rng, claim) for claim in sample]),
+        ("modifiées", [mutate(rng, claim, vocabulary) for claim in sample]),
+        ("rôles", [swap_roles(rng, claim) for claim in sample]),
+        ("nouvelles", [make_claim(rng, vocabulary) for _ in sample])
+    ]
+    
+    entries = index.stats()["entries"]
+    print(f"Affirmations indexées  : {entries} en {insert_time:.1f}s ({insert_time / args.claims * 1_000_000:.1f}µs par ajout)")
+    print(f"RSS max                : +{(rss_after - rss_before) / 1024:.1f}MB pour l'index ({(rss_after - rss_before) * 1024 / max(entries, 1):.0f} octets par affirmation)")
+    print(f"{'requêtes':<12} {'n':>7} {'trouvées':>9} {'p50':>8} {'p99':>8} {'max':>8}")
+    for name, queries in scenarios:
+        hits, durations = timed_lookups(index, queries)
+        print(
+            f"{name:<12} {len(queries):7d} {hits / len(queries):8.1%} {percentile(durations, 0.5) * 1_000_000:6.1f}µs "
+            f"{percentile(durations, 0.99) * 1_000_000:6.1f}µs {max(durations) * 1_000_000:6.1f}µs"
+        )
+    print(f"Candidats par requête  : {index.stats()['candidates_per_lookup']:.1f}")
+
+if __name__ == "__main__":
+    main()
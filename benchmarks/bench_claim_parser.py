@@ -0,0 +1,57 @@
+import argparse
+import json
+import os
+import timeit
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "0:benchmark")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_URL", "http://vera.invalid/check")
+
+from services.claim_parser import ClaimParser, decode_json, decode_legacy
+
+JSON_SAMPLE = json.dumps({
+    "summary": "Publication virale sur la réforme des retraites",
+    "extracted_text": "",
+    "language": "fr",
+    "claims": [
+        "L'âge légal de départ passe à 64 ans.",
+        "La réforme concerne 12 millions de salariés.",
+        "Le déficit atteindra 13 milliards d'euros en 2030."
+    ],
+    "claim_type": "factual"
+}, ensure_ascii=False)
+
+FENCED_SAMPLE = f"```json\n{JSON_SAMPLE}\n```"
+
+LEGACY_SAMPLE = """RESUME: Publication virale sur la réforme des retraites
+AFFIRMATIONS:
+1. L'âge légal de départ passe à 64 ans.
+2. La réforme concerne 12 millions de salariés.
+3. Le déficit atteindra 13 milliards d'euros en 2030."""
+
+DRIFTED_SAMPLE = """**Résumé** : publication virale
+- L'âge légal de départ passe à 64 ans."""
+
+def bench(label: str, func, number: int):
+    seconds = timeit.timeit(func, number=number)
+    print(f"{label:<28} {seconds / number * 1e6:8.2f} µs/parse")
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure le décodeur partagé des réponses Gemini")
+    parser.add_argument("--number", type=int, default=50_000)
+    args = parser.parse_args()
+    
+    bench("JSON (decode_json)", lambda: decode_json(JSON_SAMPLE), args.number)
+    bench("JSON entouré de ```", lambda: decode_json(FENCED_SAMPLE), args.number)
+    bench("Format lignes (legacy)", lambda: decode_legacy(LEGACY_SAMPLE), args.number)
+    
+    claim_parser = ClaimParser()
+    bench("ClaimParser.parse (lot de 4)", lambda: [
+        claim_parser.parse(sample, "texte")
+        for sample in (JSON_SAMPLE, FENCED_SAMPLE, LEGACY_SAMPLE, DRIFTED_SAMPLE)
+    ], args.number // 4)
+    print(f"Taux d'échec observé : {claim_parser.stats()['texte']['failure_rate']:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from pathlib import Path
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "0:benchmark")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_URL", "http://vera.invalid/check")
+
+from services.claim_prefilter import CHATTER, CLAIM, UNKNOWN, ClaimPrefilter
+
+DATASET = Path(__file__).parent / "data" / "claim_prefilter.jsonl"
+
+def load_dataset(path: Path) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def ratio(numerator: int, denominator: int) -> str:
+    return f"{numerator / denominator:.1%}" if denominator else "n/a"
+
+def main():
+    parser = argparse.ArgumentParser(description="Précision du pré-filtre local et appels amont évités")
+    parser.add_argument("--dataset", type=Path, default=DATASET)
+    parser.add_argument("--rounds", type=int, default=200, help="Passes sur le jeu de données pour la mesure de temps")
+    parser.add_argument("--verbose", action="store_true", help="Affiche les erreurs de classification")
+    args = parser.parse_args()
+    
+    samples = load_dataset(args.dataset)
+    prefilter = ClaimPrefilter()
+    confusion = Counter()
+    mistakes = []
+    
+    for sample in samples:
+        decision = prefilter.classify(sample["text"])
+        confusion[(decision.verdict, sample["label"])] += 1
+        expected = {CHATTER: "chatter", CLAIM: "claim"}.get(decision.verdict)
+        if expected and expected != sample["label"]:
+            mistakes.append((decision, sample))
+    
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for sample in samples:
+            prefilter.classify(sample["text"])
+    per_call = (time.perf_counter() - start) / (args.rounds * len(samples))
+    
+    labels = Counter(sample["label"] for sample in samples)
+    predicted = Counter(verdict for verdict, _ in confusion.elements())
+    chatter_ok = confusion[(CHATTER, "chatter")]
+    claim_ok = confusion[(CLAIM, "claim")]
+    gemini_saved = predicted[CHATTER] + predicted[CLAIM]
+    
+    print(f"Jeu de données         : {len(samples)} messages ({', '.join(f'{k}={v}' for k, v in labels.items())})")
+    print(f"Temps par message      : {per_call * 1_000_000:.1f}µs")
+    print(f"Bavardage              : précision {ratio(chatter_ok, predicted[CHATTER])}, rappel {ratio(chatter_ok, labels['chatter'])}")
+    print(f"Affirmation unique     : précision {ratio(claim_ok, predicted[CLAIM])}, rappel {ratio(claim_ok, labels['claim'])}")
+    print(f"Transmis à Gemini      : {predicted[UNKNOWN]} ({ratio(predicted[UNKNOWN], len(samples))})")
+    print(f"Appels Gemini évités   : {gemini_saved} ({ratio(gemini_saved, len(samples))})")
+    print(f"Appels Vera évités     : {predicted[CHATTER]} ({ratio(predicted[CHATTER], len(samples))})")
+    print(f"Affirmations ignorées  : {sum(confusion[(CHATTER, label)] for label in ('claim', 'complex'))}")
+    
+    if args.verbose:
+        for decision, sample in mistakes:
+            print(f"  {decision.verdict}/{decision.reason} attendu {sample['label']}: {sample['text']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "0:benchmark")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_URL", "http://vera.invalid/check")
+
+from benchmarks.bench_pipeline import percentile
+from benchmarks.load_concurrent_users import heartbeat
+from utils.logger import attach_handlers, create_handlers
+
+HEADERS = "Headers({'content-type': 'application/json', 'content-length': '2048', 'date': 'Sat, 18 Oct 2026 10:00:00 GMT', 'server': 'uvicorn', 'x-request-id': 'a1b2c3d4e5f6'})"
+BODY = '{"answer": "' + "Vrai. " * 120 + '"}'
+
+class SlowStream:
+    def __init__(self, path: Path, latency: float):
+        self.file = open(path, "w", encoding="utf-8")
+        self.latency = latency
+    
+    def write(self, data: str):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.file.write(data)
+    
+    def flush(self):
+        self.file.flush()
+    
+    def close(self):
+        self.file.close()
+
+def log_before(logger: logging.Logger, user_id: int):
+    logger.info("Vera response status: 200")
+    logger.info(f"Vera response headers: {HEADERS}")
+    logger.info(f"Vera raw response (first 500 chars): {BODY[:500]}")
+    logger.info(f"Fact-check réussi pour user {user_id}")
+
+def log_after(logger: logging.Logger, user_id: int):
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Vera response status: 200", extra={"event": "vera_response"})
+        logger.debug(f"Vera response headers: {HEADERS}", extra={"event": "vera_response"})
+        logger.debug(f"Vera raw response (first 500 chars): {BODY[:500]}", extra={"event": "vera_response"})
+    logger.info(f"Fact-check réussi pour user {user_id}", extra={"event": "fact_check_success"})
+
+async def simulate_user(logger: logging.Logger, log_call, user_id: int, requests: int):
+    for _ in range(requests):
+        logger.info(f"Message texte reçu de {user_id}: La tour Eiffel mesure 330 mètres...", extra={"event": "message_received"})
+        await asyncio.sleep(0)
+        log_call(logger, user_id)
+        await asyncio.sleep(0)
+
+async def run_scenario(name: str, queued: bool, log_call, args, workdir: Path) -> dict:
+    logger = logging.getLogger(f"bench_logging.{name}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    stream = SlowStream(workdir / f"{name}.console", args.write_latency_us / 1_000_000)
+    listener = attach_handlers(logger, create_handlers(workdir / f"{name}.log", stream), queued)
+    
+    stop = asyncio.Event()
+    lags: list[float] = []
+    monitor = asyncio.create_task(heartbeat(stop, lags, interval=0.001))
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(simulate_user(logger, log_call, user, args.requests) for user in range(args.users)))
+    elapsed = time.perf_counter() - start
+    
+    stop.set()
+    await monitor
+    if listener:
+        listener.stop()
+    for handler in logger.handlers:
+        handler.close()
+    stream.close()
+    
+    return {
+        "elapsed": elapsed,
+        "max_lag": max(lags, default=0),
+        "p99_lag": percentile(lags, 0.99),
+        "lines": sum(1 for _ in open(workdir / f"{name}.log", encoding="utf-8")),
+        "size": (workdir / f"{name}.log").stat().st_size
+    }
+
+async def run(args):
+    scenarios = [
+        ("avant", False, log_before, "handlers synchrones, en-têtes et corps Vera en INFO"),
+        ("synchrone", False, log_after, "handlers synchrones, nouveaux niveaux et échantillonnage"),
+        ("apres", True, log_after, "file + QueueListener, nouveaux niveaux et échantillonnage")
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{args.users} utilisateurs x {args.requests} requêtes, latence d'écriture {args.write_latency_us}µs")
+        print(f"{'scénario':<12} {'durée':>8} {'blocage max':>12} {'p99':>8} {'lignes':>8} {'taille':>9}")
+        for name, queued, log_call, description in scenarios:
+            result = await run_scenario(name, queued, log_call, args, Path(tmp))
+            print(
+                f"{name:<12} {result['elapsed']:7.2f}s {result['max_lag'] * 1000:10.1f}ms {result['p99_lag'] * 1000:6.1f}ms "
+                f"{result['lines']:8d} {result['size'] / 1024:7.0f}KB  ({description})"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure le blocage de la boucle asyncio causé par les logs")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--write-latency-us", type=int, default=200, help="Latence simulée par écriture console (pipe ou disque lent)")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
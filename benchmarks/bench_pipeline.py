@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import resource
+import time
+import tracemalloc
+from collections import defaultdict
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "0:benchmark")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_URL", "http://vera.invalid/check")
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("AUDIO_PREPROCESS_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import google.generativeai as genai
+import httpx
+from telegram import Update
+from telegram.ext import Application
+
+from benchmarks.fakes import (
+    FakeGeminiFiles,
+    FakeGeminiModel,
+    FakeTelegramRequest,
+    LatencyProfile,
+    file_transport,
+    vera_transport
+)
+from config.settings import settings
+from main import build_application
+from services.clients import CLIENTS_KEY, close_clients, init_clients
+from services.vera_client import VeraClient
+
+MEDIA_SIZES = {
+    "image": 180 * 1024,
+    "video": 6 * 1024 * 1024,
+    "audio": 400 * 1024
+}
+
+TEXTS = [
+    "La tour Eiffel mesure 330 mètres depuis 2022.",
+    "Le vaccin contre la grippe contient une puce électronique.",
+    "La France a gagné la Coupe du monde en 2018.",
+    "Boire de l'eau chaude guérit le rhume en une nuit."
+]
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, weight = part.split("=")
+        if name not in ("text", *MEDIA_SIZES):
+            raise argparse.ArgumentTypeError(f"Type de contenu inconnu: {name}")
+        mix[name] = float(weight)
+    return mix
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+def make_update(update_id: int, user_id: int, kind: str, files: dict[str, bytes], rng: random.Random) -> dict:
+    message = {
+        "message_id": update_id,
+        "date": int(time.time()),
+        "chat": {"id": update_id, "type": "private"},
+        "from": {"id": user_id, "is_bot": False, "first_name": "Bench"}
+    }
+    
+    if kind == "text":
+        message["text"] = rng.choice(TEXTS)
+        return {"update_id": update_id, "message": message}
+    
+    file_id = f"{kind}-{update_id}"
+    files[file_id] = rng.randbytes(MEDIA_SIZES[kind])
+    media = {"file_id": file_id, "file_unique_id": file_id, "file_size": MEDIA_SIZES[kind]}
+    
+    if kind == "image":
+        message["photo"] = [
+            {**media, "file_id": f"{file_id}-thumb", "file_unique_id": f"{file_id}-thumb", "width": 90, "height": 90, "file_size": 2048},
+            {**media, "width": 800, "height": 600}
+        ]
+        files[f"{file_id}-thumb"] = rng.randbytes(2048)
+    elif kind == "video":
+        message["video"] = {**media, "width": 1280, "height": 720, "duration": 30, "mime_type": "video/mp4"}
+    else:
+        message["voice"] = {**media, "duration": 20, "mime_type": "audio/ogg"}
+    
+    return {"update_id": update_id, "message": message}
+
+async def install_fakes(
+    application: Application,
+    files: dict[str, bytes],
+    gemini: LatencyProfile,
+    upload: LatencyProfile,
+    vera: LatencyProfile,
+    vera_streaming: bool,
+    keep_cache: bool,
+    rng: random.Random
+):
+    await init_clients(application)
+    clients = application.bot_data[CLIENTS_KEY]
+    
+    uploads = FakeGeminiFiles(upload, rng)
+    genai.upload_file = uploads.upload_file
+    genai.delete_file = uploads.delete_file
+    clients.gemini.model = FakeGeminiModel(gemini, rng)
+    if clients.gemini.fast_model:
+        clients.gemini.fast_model = FakeGeminiModel(LatencyProfile(gemini.mean / 3, gemini.jitter / 3, gemini.error_rate), rng)
+    
+    transport = vera_transport(vera, rng, streaming=vera_streaming)
+    cache = clients.vera.cache if keep_cache else None
+    await clients.vera.client.aclose()
+    if clients.vera.cache and not keep_cache:
+        clients.vera.cache.close()
+    claim_index = clients.vera.claim_index if keep_cache else None
+    clients.vera = VeraClient(http_client=httpx.AsyncClient(transport=transport), cache=cache, claim_index=claim_index)
+    
+    await clients.files.aclose()
+    clients.files = httpx.AsyncClient(transport=file_transport(files))
+    
+    return uploads, transport
+
+async def dispatch(application: Application, update: Update, kind: str, latencies: dict[str, list[float]]):
+    start = time.perf_counter()
+    await application.process_update(update)
+    latencies[kind].append(time.perf_counter() - start)
+
+def print_latency_row(label: str, values: list[float]):
+    print(
+        f"  {label:<20} : {len(values):6d} {percentile(values, 0.5):7.2f} {percentile(values, 0.95):7.2f} "
+        f"{percentile(values, 0.99):7.2f} {max(values, default=0):7.2f}"
+    )
+
+def print_report(
+    application: Application,
+    telegram: FakeTelegramRequest,
+    uploads: FakeGeminiFiles,
+    vera: httpx.MockTransport,
+    latencies: dict[str, list[float]],
+    kinds: list[str],
+    wall: float
+):
+    clients = application.bot_data[CLIENTS_KEY]
+    count = sum(len(values) for values in latencies.values())
+    failed = sum(telegram.error_replies.values())
+    
+    print(f"Durée totale           : {wall:.2f}s")
+    print(f"Débit                  : {count / wall:.1f} messages/s")
+    print(f"Réponses d'erreur      : {failed} ({failed / max(count, 1):.1%})")
+    for reply, occurrences in telegram.error_replies.most_common():
+        print(f"  {reply:<20} : {occurrences}")
+    print("Latence (s)            :      n     p50     p95     p99     max")
+    for kind in kinds:
+        if latencies[kind]:
+            print_latency_row(kind, latencies[kind])
+    print_latency_row("total", [value for values in latencies.values() for value in values])
+    print(
+        f"Appels amont           : Gemini {clients.gemini.model.calls} lourd / "
+        f"{clients.gemini.fast_model.calls if clients.gemini.fast_model else 0} rapide, uploads {uploads.uploads}, "
+        f"Vera {vera.calls['requests']} ({vera.calls['errors']} erreurs), "
+        f"Telegram {sum(telegram.calls.values())} ({telegram.errors} erreurs)"
+    )
+
+async def run(args):
+    rng = random.Random(args.seed)
+    files: dict[str, bytes] = {}
+    telegram = FakeTelegramRequest(args.telegram, rng, files)
+    
+    builder = Application.builder().token(settings.telegram_bot_token).request(telegram).get_updates_request(telegram)
+    application = build_application(builder)
+    await application.initialize()
+    uploads, vera = await install_fakes(
+        application, files, args.gemini, args.upload, args.vera, args.vera_streaming, args.cache, rng
+    )
+    
+    kinds = list(args.mix)
+    weights = [args.mix[kind] for kind in kinds]
+    users = itertools.cycle(range(1, args.users + 1))
+    plan = [rng.choices(kinds, weights)[0] for _ in range(args.count)]
+    updates = [
+        Update.de_json(make_update(update_id, next(users), kind, files, rng), application.bot)
+        for update_id, kind in enumerate(plan, start=1)
+    ]
+    
+    if args.tracemalloc:
+        tracemalloc.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    latencies: dict[str, list[float]] = defaultdict(list)
+    loop = asyncio.get_running_loop()
+    tasks = []
+    start = loop.time()
+    
+    for index, (update, kind) in enumerate(zip(updates, plan)):
+        delay = start + index / args.rate - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(dispatch(application, update, kind, latencies)))
+    
+    await asyncio.gather(*tasks)
+    wall = loop.time() - start
+    
+    traced_peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else None
+    if args.tracemalloc:
+        tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    print(f"Messages envoyés       : {args.count} à {args.rate:.1f}/s ({', '.join(f'{k}={v:g}' for k, v in args.mix.items())})")
+    print_report(application, telegram, uploads, vera, latencies, kinds, wall)
+    print(f"RSS max                : {rss_after / 1024:.1f}MB (+{(rss_after - rss_before) / 1024:.1f}MB pendant la charge)")
+    if traced_peak is not None:
+        print(f"Pic tracemalloc        : {traced_peak / 1024 / 1024:.1f}MB")
+    
+    await close_clients(application)
+    await application.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne du pipeline complet avec des services simulés")
+    parser.add_argument("--count", type=int, default=200, help="Nombre de messages à envoyer")
+    parser.add_argument("--rate", type=float, default=20.0, help="Messages par seconde")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("text=0.5,image=0.25,video=0.1,audio=0.15"))
+    parser.add_argument("--gemini", type=LatencyProfile.parse, default=LatencyProfile(1.0, 0.3, 0.01), help="moyenne:écart:taux_erreur")
+    parser.add_argument("--upload", type=LatencyProfile.parse, default=LatencyProfile(0.3, 0.1, 0.0))
+    parser.add_argument("--vera", type=LatencyProfile.parse, default=LatencyProfile(0.8, 0.2, 0.01))
+    parser.add_argument("--telegram", type=LatencyProfile.parse, default=LatencyProfile(0.05, 0.02, 0.0))
+    parser.add_argument("--vera-streaming", action="store_true")
+    parser.add_argument("--cache", action="store_true", help="Garde le cache de fact-checking et l'index d'affirmations proches (les textes se répètent)")
+    parser.add_argument("--tracemalloc", action="store_true", help="Mesure le pic d'allocations Python (ralentit le benchmark)")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
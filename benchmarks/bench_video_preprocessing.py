@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "0:benchmark")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_URL", "http://vera.invalid/check")
+os.environ.setdefault("VIDEO_PREPROCESS_MIN_MB", "0")
+
+import google.generativeai as genai
+
+from benchmarks.bench_pipeline import percentile
+from benchmarks.fakes import FakeGeminiFiles, FakeGeminiModel, LatencyProfile
+from services.gemini_client import GeminiClient
+from services.media_preprocessor import MediaPreprocessor
+
+def generate_sample(destination: Path, seconds: int):
+    subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-y",
+            "-f", "lavfi", "-i", f"testsrc=size=1280x720:rate=30:duration={seconds}",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+            "-c:v", "libx264", "-b:v", "4M", "-c:a", "aac", "-shortest", str(destination)
+        ],
+        check=True
+    )
+
+async def measure(gemini: GeminiClient, preprocessor: MediaPreprocessor, video: Path, mode: str) -> tuple[int, float, float]:
+    start = time.perf_counter()
+    prepared = await preprocessor.prepare_video(video, mode) if mode != "original" else None
+    preprocessed = time.perf_counter()
+    
+    try:
+        if prepared:
+            await gemini.analyze_video(prepared.video, "bench", prepared.mime_type, keyframes=prepared.keyframes)
+            sent = prepared.bytes_out
+        else:
+            await gemini.analyze_video(video, "bench", "video/mp4")
+            sent = video.stat().st_size
+    finally:
+        if prepared:
+            prepared.discard()
+    
+    return sent, preprocessed - start, time.perf_counter() - start
+
+async def run(video: Path, bandwidth_mbps: float, generate_seconds: float, repeat: int, workers: int):
+    rng = random.Random(0)
+    uploads = FakeGeminiFiles(LatencyProfile(0.3, 0.05), rng, bandwidth_mbps=bandwidth_mbps)
+    genai.upload_file = uploads.upload_file
+    genai.delete_file = uploads.delete_file
+    
+    gemini = GeminiClient()
+    gemini.uploads = None
+    gemini.model = FakeGeminiModel(LatencyProfile(generate_seconds, generate_seconds / 10), rng)
+    if gemini.fast_model:
+        gemini.fast_model = FakeGeminiModel(LatencyProfile(generate_seconds, generate_seconds / 10), rng)
+    preprocessor = MediaPreprocessor(workers=workers)
+    
+    modes = ["original"]
+    if preprocessor.available:
+        modes += ["downscale", "audio_keyframes"]
+    else:
+        print("ffmpeg/ffprobe introuvables : seul l'envoi du fichier original est mesuré")
+    
+    size = video.stat().st_size
+    print(f"Vidéo : {video} ({size / 1024 / 1024:.1f}MB), {repeat} passages par mode")
+    print(f"Gemini simulé (benchmarks/fakes.py) : upload 0.3s + {bandwidth_mbps:g} Mbit/s, génération {generate_seconds:g}s")
+    print(f"{'mode':<16} {'octets envoyés':>15} {'gain':>7} {'prétraitement':>14} {'total p50':>10} {'total max':>10}")
+    
+    try:
+        for mode in modes:
+            results = [await measure(gemini, preprocessor, video, mode) for _ in range(repeat)]
+            sent = results[-1][0]
+            totals = [total for _, _, total in results]
+            gain = f"{1 - sent / size:.0%}" if mode != "original" else "-"
+            print(
+                f"{mode:<16} {sent:>15,} {gain:>7} {percentile([prep for _, prep, _ in results], 0.5):>13.2f}s "
+                f"{percentile(totals, 0.5):>9.2f}s {max(totals):>9.2f}s"
+            )
+    finally:
+        preprocessor.close()
+        await gemini.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure octets envoyés et latence bout en bout (prétraitement + upload + génération) selon le mode de prétraitement vidéo")
+    parser.add_argument("video", type=Path, nargs="?", help="vidéo à tester (par défaut un clip testsrc/sine généré avec ffmpeg)")
+    parser.add_argument("--duration", type=int, default=30, help="durée du clip généré (s)")
+    parser.add_argument("--bandwidth-mbps", type=float, default=20.0, help="débit montant simulé vers Gemini")
+    parser.add_argument("--generate-seconds", type=float, default=2.0, help="latence simulée de génération Gemini")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    
+    workdir = None
+    video = args.video
+    if video is None:
+        if not shutil.which("ffmpeg"):
+            raise SystemExit("ffmpeg est requis pour générer le clip de test, ou passez une vidéo en argument")
+        workdir = Path(tempfile.mkdtemp(prefix="bench-video-"))
+        video = workdir / "sample.mp4"
+        generate_sample(video, args.duration)
+    
+    try:
+        asyncio.run(run(video, args.bandwidth_mbps, args.generate_seconds, args.repeat, args.workers))
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
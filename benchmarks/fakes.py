@@ -0,0 +1,194 @@
+import asyncio
+import itertools
+import json
+import os
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+import httpx
+from telegram.request import BaseRequest, RequestData
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+
+FAKE_ANALYSIS = {
+    "summary": "Publication virale sur la tour Eiffel",
+    "extracted_text": "La tour Eiffel mesure 330 mètres et a été construite en 1889.",
+    "language": "fr",
+    "claims": ["La tour Eiffel mesure 330 mètres.", "La tour Eiffel a été construite en 1889."],
+    "claim_type": "factual"
+}
+
+ERROR_MARKERS = ("Réessayez ou envoyez /help", "Une erreur s'est produite")
+
+FAKE_VERDICT = "Vrai. La tour Eiffel mesure 330 mètres depuis l'ajout de ses antennes."
+
+@dataclass
+class LatencyProfile:
+    mean: float
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    
+    @classmethod
+    def parse(cls, value: str) -> "LatencyProfile":
+        parts = [float(part) for part in value.split(":")]
+        return cls(*parts)
+    
+    def delay(self, rng: random.Random) -> float:
+        return max(0.0, rng.gauss(self.mean, self.jitter)) if self.jitter else self.mean
+    
+    def fails(self, rng: random.Random) -> bool:
+        return self.error_rate > 0 and rng.random() < self.error_rate
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeFile:
+    def __init__(self, name: str):
+        self.name = name
+
+class FakeGeminiModel:
+    def __init__(self, profile: LatencyProfile, rng: random.Random, answer: Optional[dict] = None):
+        self.profile = profile
+        self.rng = rng
+        self.answer = json.dumps(answer or FAKE_ANALYSIS, ensure_ascii=False)
+        self.calls = 0
+        self.errors = 0
+    
+    async def generate_content_async(self, contents, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.profile.delay(self.rng))
+        if self.profile.fails(self.rng):
+            self.errors += 1
+            raise RuntimeError("Erreur Gemini simulée")
+        return FakeResponse(self.answer)
+
+class FakeGeminiFiles:
+    def __init__(self, profile: LatencyProfile, rng: random.Random, bandwidth_mbps: Optional[float] = None):
+        self.profile = profile
+        self.rng = rng
+        self.bandwidth_mbps = bandwidth_mbps
+        self.counter = itertools.count(1)
+        self.uploads = 0
+        self.deletes = 0
+        self.bytes_uploaded = 0
+    
+    def upload_file(self, path=None, mime_type=None, **kwargs):
+        self.uploads += 1
+        size = os.path.getsize(path) if isinstance(path, (str, os.PathLike)) else path.getbuffer().nbytes
+        self.bytes_uploaded += size
+        transfer = size * 8 / (self.bandwidth_mbps * 1_000_000) if self.bandwidth_mbps else 0.0
+        time.sleep(self.profile.delay(self.rng) + transfer)
+        if self.profile.fails(self.rng):
+            raise RuntimeError("Erreur d'upload Gemini simulée")
+        return FakeFile(f"files/bench-{next(self.counter)}")
+    
+    def delete_file(self, name, **kwargs):
+        self.deletes += 1
+
+def vera_transport(profile: LatencyProfile, rng: random.Random, streaming: bool = False, chunk_size: int = 16) -> httpx.MockTransport:
+    calls = Counter()
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls["requests"] += 1
+        await asyncio.sleep(profile.delay(rng))
+        if profile.fails(rng):
+            calls["errors"] += 1
+            return httpx.Response(503, text="Service Vera indisponible (simulé)")
+        
+        if not streaming:
+            return httpx.Response(200, json={"answer": FAKE_VERDICT, "sources": []})
+        
+        events = [
+            f"data: {json.dumps({'delta': FAKE_VERDICT[i:i + chunk_size]}, ensure_ascii=False)}\n\n"
+            for i in range(0, len(FAKE_VERDICT), chunk_size)
+        ]
+        events.append("data: [DONE]\n\n")
+        return httpx.Response(200, text="".join(events), headers={"content-type": "text/event-stream"})
+    
+    transport = httpx.MockTransport(handler)
+    transport.calls = calls
+    return transport
+
+def file_transport(files: dict[str, bytes]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        content = files.get(request.url.path.rsplit("/", 1)[-1])
+        if content is None:
+            return httpx.Response(404)
+        return httpx.Response(200, content=content, headers={"content-length": str(len(content))})
+    
+    return httpx.MockTransport(handler)
+
+class FakeTelegramRequest(BaseRequest):
+    def __init__(self, profile: LatencyProfile, rng: random.Random, files: dict[str, bytes]):
+        self.profile = profile
+        self.rng = rng
+        self.files = files
+        self.calls = Counter()
+        self.errors = 0
+        self.error_replies = Counter()
+        self._message_ids = itertools.count(1)
+    
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return None
+    
+    async def initialize(self):
+        pass
+    
+    async def shutdown(self):
+        pass
+    
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: Optional[RequestData] = None,
+        read_timeout=None,
+        write_timeout=None,
+        connect_timeout=None,
+        pool_timeout=None
+    ) -> tuple[int, bytes]:
+        api_method = url.rsplit("/", 1)[-1]
+        self.calls[api_method] += 1
+        params = request_data.parameters if request_data else {}
+        
+        if api_method != "getMe":
+            await asyncio.sleep(self.profile.delay(self.rng))
+            if self.profile.fails(self.rng):
+                self.errors += 1
+                return 500, json.dumps({"ok": False, "error_code": 500, "description": "Internal Server Error"}).encode()
+        
+        return 200, json.dumps({"ok": True, "result": self._result(api_method, params)}).encode()
+    
+    def _message(self, params: dict, message_id: Optional[int] = None) -> dict:
+        chat_id = int(params["chat_id"])
+        text = params.get("text", "")
+        if any(marker in text for marker in ERROR_MARKERS):
+            self.error_replies[text.split("\n", 1)[0]] += 1
+        return {
+            "message_id": message_id or next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+            "text": text
+        }
+    
+    def _result(self, api_method: str, params: dict):
+        if api_method == "getMe":
+            return BOT_USER
+        if api_method == "sendMessage":
+            return self._message(params)
+        if api_method == "editMessageText":
+            return self._message(params, int(params["message_id"]))
+        if api_method == "getFile":
+            file_id = params["file_id"]
+            return {
+                "file_id": file_id,
+                "file_unique_id": file_id,
+                "file_size": len(self.files.get(file_id, b"")),
+                "file_path": f"media/{file_id}"
+            }
+        return True
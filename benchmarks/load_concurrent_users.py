@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from io import BytesIO
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "0:benchmark")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_URL", "http://vera.invalid/check")
+
+import google.generativeai as genai
+
+from benchmarks.fakes import FakeFile, FakeResponse
+from services.gemini_client import GeminiClient
+
+FAKE_ANSWER = '{"summary": "Une vidéo virale", "claims": ["La tour Eiffel mesure 330 mètres."]}'
+
+class FakeModel:
+    def __init__(self, latency: float):
+        self.latency = latency
+    
+    async def generate_content_async(self, contents, **kwargs):
+        await asyncio.sleep(self.latency)
+        return FakeResponse(FAKE_ANSWER)
+
+def fake_upload_file(latency: float):
+    def upload_file(path, **kwargs):
+        time.sleep(latency)
+        return FakeFile(f"files/{id(path)}")
+    return upload_file
+
+async def heartbeat(stop: asyncio.Event, lags: list[float], interval: float = 0.01):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+async def serve_user(client: GeminiClient, user_id: int) -> float:
+    start = time.perf_counter()
+    await client.analyze_video(BytesIO(f"video-{user_id}".encode()), str(user_id), "video/mp4")
+    return time.perf_counter() - start
+
+async def run(users: int, upload_latency: float, generate_latency: float):
+    genai.upload_file = fake_upload_file(upload_latency)
+    client = GeminiClient()
+    client.model = FakeModel(generate_latency)
+    
+    stop = asyncio.Event()
+    lags: list[float] = []
+    monitor = asyncio.create_task(heartbeat(stop, lags))
+    
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(serve_user(client, i) for i in range(users)))
+    wall = time.perf_counter() - start
+    
+    stop.set()
+    await monitor
+    
+    serial = users * (upload_latency + generate_latency)
+    print(f"Utilisateurs simultanés : {users}")
+    print(f"Durée totale           : {wall:.2f}s (séquentiel attendu : {serial:.2f}s)")
+    print(f"Facteur de recouvrement: {serial / wall:.1f}x")
+    print(f"Latence p50 / max      : {statistics.median(latencies):.2f}s / {max(latencies):.2f}s")
+    print(f"Blocage boucle max     : {max(lags, default=0) * 1000:.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Charge N utilisateurs simultanés sur GeminiClient")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--upload-latency", type=float, default=0.5)
+    parser.add_argument("--generate-latency", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.upload_latency, args.generate_latency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import os
+import random
+from collections import defaultdict
+from pathlib import Path
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "0:benchmark")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_KEY", "benchmark")
+os.environ.setdefault("VERA_API_URL", "http://vera.invalid/check")
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("AUDIO_PREPROCESS_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "true")
+os.environ.setdefault("UPDATE_RECORDING_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from telegram import Update
+from telegram.ext import Application
+
+from benchmarks.bench_pipeline import dispatch, install_fakes, print_report
+from benchmarks.fakes import FakeTelegramRequest, LatencyProfile
+from config.settings import settings
+from handlers.middleware import classify_update
+from main import build_application
+from services.clients import CLIENTS_KEY, close_clients
+from services.update_recorder import MEDIA_FIELDS, load_recording
+
+class PlaceholderFiles(dict):
+    def __init__(self, sizes: dict[str, int]):
+        super().__init__()
+        self.sizes = sizes
+    
+    def get(self, file_id, default=None):
+        if file_id not in self.sizes:
+            return default
+        prefix = file_id.encode()
+        return prefix + bytes(max(0, self.sizes[file_id] - len(prefix)))
+
+def placeholder_sizes(entries: list[dict]) -> dict[str, int]:
+    sizes = {}
+    for entry in entries:
+        message = entry["u"].get("message", {})
+        for key in MEDIA_FIELDS:
+            media = message.get(key)
+            for item in media if isinstance(media, list) else [media] if media else []:
+                sizes[item["file_id"]] = item.get("file_size") or 64 * 1024
+    return sizes
+
+def content_kind(update: Update) -> str:
+    content_type = classify_update(update)
+    if content_type:
+        return content_type.value
+    if update.message and update.message.text and update.message.text.startswith("/"):
+        return "commande"
+    return "autre"
+
+async def run(args):
+    entries = sorted(load_recording(args.log, args.limit), key=lambda entry: entry["t"])
+    if not entries:
+        print(f"Aucune update dans {args.log}")
+        return
+    
+    rng = random.Random(args.seed)
+    files = PlaceholderFiles(placeholder_sizes(entries))
+    telegram = FakeTelegramRequest(args.telegram, rng, files)
+    
+    builder = Application.builder().token(settings.telegram_bot_token).request(telegram).get_updates_request(telegram)
+    application = build_application(builder)
+    await application.initialize()
+    uploads, vera = await install_fakes(
+        application, files, args.gemini, args.upload, args.vera, args.vera_streaming, args.cache, rng
+    )
+    
+    updates = [Update.de_json(entry["u"], application.bot) for entry in entries]
+    kinds = [content_kind(update) for update in updates]
+    origin = entries[0]["t"]
+    recorded_span = entries[-1]["t"] - origin
+    
+    latencies: dict[str, list[float]] = defaultdict(list)
+    loop = asyncio.get_running_loop()
+    tasks = []
+    max_lag = 0.0
+    start = loop.time()
+    
+    for entry, update, kind in zip(entries, updates, kinds):
+        target = start + (entry["t"] - origin) / args.speed
+        delay = target - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        max_lag = max(max_lag, loop.time() - target)
+        tasks.append(asyncio.create_task(dispatch(application, update, kind, latencies)))
+    
+    await asyncio.gather(*tasks)
+    wall = loop.time() - start
+    
+    print(f"Journal rejoué         : {args.log} ({len(entries)} updates sur {recorded_span:.1f}s enregistrées)")
+    print(f"Vitesse                : x{args.speed:g} ({len(entries) / max(recorded_span / args.speed, 1e-3):.1f} updates/s en moyenne)")
+    print(f"Retard d'injection max : {max_lag * 1000:.1f}ms")
+    print_report(application, telegram, uploads, vera, latencies, sorted(set(kinds)), wall)
+    
+    scheduler = application.bot_data[CLIENTS_KEY].scheduler
+    if scheduler:
+        print("File d'attente         :   admis  en file  rejetés  attente moy  attente max")
+        for lane, stats in scheduler.stats().items():
+            if stats["admitted"] or stats["rejected"]:
+                print(
+                    f"  {lane:<20} : {stats['admitted']:7d} {stats['queued']:8d} {stats['rejected']:8d} "
+                    f"{stats['avg_wait']:11.2f}s {stats['max_wait']:11.2f}s"
+                )
+    
+    await close_clients(application)
+    await application.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejoue un journal d'updates Telegram contre des services simulés")
+    parser.add_argument("log", type=Path, help="Fichier JSONL produit par UPDATE_RECORDING_ENABLED")
+    parser.add_argument("--speed", type=float, default=1.0, help="Facteur d'accélération (1, 10, 100...)")
+    parser.add_argument("--limit", type=int, default=None, help="Nombre maximal d'updates à rejouer")
+    parser.add_argument("--gemini", type=LatencyProfile.parse, default=LatencyProfile(1.0, 0.3, 0.01), help="moyenne:écart:taux_erreur")
+    parser.add_argument("--upload", type=LatencyProfile.parse, default=LatencyProfile(0.3, 0.1, 0.0))
+    parser.add_argument("--vera", type=LatencyProfile.parse, default=LatencyProfile(0.8, 0.2, 0.01))
+    parser.add_argument("--telegram", type=LatencyProfile.parse, default=LatencyProfile(0.05, 0.02, 0.0))
+    parser.add_argument("--vera-streaming", action="store_true")
+    parser.add_argument("--cache", action="store_true", help="Garde le cache de fact-checking")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
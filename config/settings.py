@@ -2,29 +2,162 @@ from pathlib import Path
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 from pydantic import Field
+from typing import Optional
 
 load_dotenv()
 
 class Settings(BaseSettings):
     telegram_bot_token: str = Field(..., env="TELEGRAM_BOT_TOKEN")
+    telegram_mode: str = Field(default="polling", env="TELEGRAM_MODE")
+    
+    webhook_url: Optional[str] = Field(default=None, env="WEBHOOK_URL")
+    webhook_listen: str = Field(default="0.0.0.0", env="WEBHOOK_LISTEN")
+    webhook_port: int = Field(default=8443, env="WEBHOOK_PORT")
+    webhook_path: str = Field(default="telegram", env="WEBHOOK_PATH")
+    webhook_secret_token: Optional[str] = Field(default=None, env="WEBHOOK_SECRET_TOKEN")
+    webhook_max_connections: int = Field(default=40, env="WEBHOOK_MAX_CONNECTIONS")
     
     gemini_api_key: str = Field(..., env="GEMINI_API_KEY")
     gemini_model: str = Field(default="gemini-2.5-pro", env="GEMINI_MODEL")
+    gemini_fast_model: Optional[str] = Field(default="gemini-2.5-flash", env="GEMINI_FAST_MODEL")
+    gemini_fast_content_types: list[str] = Field(default=["texte", "lien", "image", "audio"], env="GEMINI_FAST_CONTENT_TYPES")
+    gemini_fast_max_text_chars: int = Field(default=2_000, env="GEMINI_FAST_MAX_TEXT_CHARS")
+    gemini_fast_max_media_mb: float = Field(default=4.0, env="GEMINI_FAST_MAX_MEDIA_MB")
+    gemini_escalate_on_empty: bool = Field(default=True, env="GEMINI_ESCALATE_ON_EMPTY")
     
     vera_api_key: str = Field(..., env="VERA_API_KEY")
     vera_api_url: str = Field(..., env="VERA_API_URL")
     
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
+    log_format: str = Field(default="text", env="LOG_FORMAT")
+    log_file_path: Path = Field(default=Path("./logs/bot.log"), env="LOG_FILE_PATH")
+    log_rotation: str = Field(default="size", env="LOG_ROTATION")
+    log_max_bytes: int = Field(default=20 * 1024 * 1024, env="LOG_MAX_BYTES")
+    log_rotation_when: str = Field(default="midnight", env="LOG_ROTATION_WHEN")
+    log_backup_count: int = Field(default=5, env="LOG_BACKUP_COUNT")
+    log_queue_enabled: bool = Field(default=True, env="LOG_QUEUE_ENABLED")
+    log_queue_size: int = Field(default=10_000, env="LOG_QUEUE_SIZE")
+    log_sample_rates: dict[str, float] = Field(
+        default={"message_received": 1.0, "fact_check_success": 0.1, "cache_hit": 0.1},
+        env="LOG_SAMPLE_RATES"
+    )
+    
+    metrics_enabled: bool = Field(default=True, env="METRICS_ENABLED")
+    metrics_addr: str = Field(default="127.0.0.1", env="METRICS_ADDR")
+    metrics_port: int = Field(default=9464, env="METRICS_PORT")
+    
+    slow_request_seconds: float = Field(default=30.0, env="SLOW_REQUEST_SECONDS")
+    profiler_enabled: bool = Field(default=False, env="PROFILER_ENABLED")
+    profiler_interval_ms: int = Field(default=10, env="PROFILER_INTERVAL_MS")
+    profiler_dump_interval: float = Field(default=60.0, env="PROFILER_DUMP_INTERVAL")
+    profiler_output_path: Path = Field(default=Path("./logs/profile.folded"), env="PROFILER_OUTPUT_PATH")
+    
+    update_recording_enabled: bool = Field(default=False, env="UPDATE_RECORDING_ENABLED")
+    update_recording_path: Path = Field(default=Path("./logs/updates.jsonl"), env="UPDATE_RECORDING_PATH")
+    update_recording_salt: Optional[str] = Field(default=None, env="UPDATE_RECORDING_SALT")
+    update_recording_keep_text: bool = Field(default=False, env="UPDATE_RECORDING_KEEP_TEXT")
+    
     max_file_size_mb: int = Field(default=20, env="MAX_FILE_SIZE_MB")
     max_image_size_mb: int = Field(default=10, env="MAX_IMAGE_SIZE_MB")
     max_video_size_mb: int = Field(default=50, env="MAX_VIDEO_SIZE_MB")
     max_audio_size_mb: int = Field(default=10, env="MAX_AUDIO_SIZE_MB")
     temp_download_path: Path = Field(default=Path("./temp_downloads"), env="TEMP_DOWNLOAD_PATH")
+    memory_download_threshold_mb: int = Field(default=8, env="MEMORY_DOWNLOAD_THRESHOLD_MB")
+    
+    media_preprocess_workers: int = Field(default=2, env="MEDIA_PREPROCESS_WORKERS")
+    media_preprocess_timeout: float = Field(default=120.0, env="MEDIA_PREPROCESS_TIMEOUT")
+    video_preprocess_mode: str = Field(default="off", env="VIDEO_PREPROCESS_MODE")
+    video_preprocess_min_mb: float = Field(default=2.0, env="VIDEO_PREPROCESS_MIN_MB")
+    video_max_height: int = Field(default=480, env="VIDEO_MAX_HEIGHT")
+    video_fps: int = Field(default=15, env="VIDEO_FPS")
+    video_bitrate: str = Field(default="600k", env="VIDEO_BITRATE")
+    video_audio_bitrate: str = Field(default="32k", env="VIDEO_AUDIO_BITRATE")
+    video_keyframe_interval: float = Field(default=5.0, env="VIDEO_KEYFRAME_INTERVAL")
+    video_max_keyframes: int = Field(default=12, env="VIDEO_MAX_KEYFRAMES")
+    image_target_pixels: int = Field(default=360_000, env="IMAGE_TARGET_PIXELS")
+    image_recompress: bool = Field(default=False, env="IMAGE_RECOMPRESS")
+    image_max_side: int = Field(default=1280, env="IMAGE_MAX_SIDE")
+    image_jpeg_quality: int = Field(default=80, env="IMAGE_JPEG_QUALITY")
+    audio_preprocess_enabled: bool = Field(default=True, env="AUDIO_PREPROCESS_ENABLED")
+    audio_preprocess_min_kb: int = Field(default=64, env="AUDIO_PREPROCESS_MIN_KB")
+    audio_bitrate: str = Field(default="24k", env="AUDIO_BITRATE")
+    audio_silence_threshold_db: int = Field(default=-45, env="AUDIO_SILENCE_THRESHOLD_DB")
+    audio_min_silence: float = Field(default=0.7, env="AUDIO_MIN_SILENCE")
     
     gemini_timeout: int = 120
     vera_timeout: int = 60
     telegram_download_timeout: int = 30
     
+    concurrent_updates: int = Field(default=320, env="CONCURRENT_UPDATES")
+    gemini_max_concurrency: int = Field(default=16, env="GEMINI_MAX_CONCURRENCY")
+    gemini_upload_workers: int = Field(default=8, env="GEMINI_UPLOAD_WORKERS")
+    gemini_upload_registry_enabled: bool = Field(default=True, env="GEMINI_UPLOAD_REGISTRY_ENABLED")
+    gemini_upload_registry_max_entries: int = Field(default=1_000, env="GEMINI_UPLOAD_REGISTRY_MAX_ENTRIES")
+    gemini_upload_registry_ttl_seconds: int = Field(default=46 * 3600, env="GEMINI_UPLOAD_REGISTRY_TTL_SECONDS")
+    gemini_breaker_threshold: int = Field(default=5, env="GEMINI_BREAKER_THRESHOLD")
+    gemini_breaker_recovery: float = Field(default=30.0, env="GEMINI_BREAKER_RECOVERY")
+    gemini_retry_attempts: int = Field(default=3, env="GEMINI_RETRY_ATTEMPTS")
+    gemini_retry_base_delay: float = Field(default=1.0, env="GEMINI_RETRY_BASE_DELAY")
+    gemini_retry_max_delay: float = Field(default=8.0, env="GEMINI_RETRY_MAX_DELAY")
+    
+    vera_http2: bool = Field(default=True, env="VERA_HTTP2")
+    vera_max_connections: int = Field(default=50, env="VERA_MAX_CONNECTIONS")
+    vera_max_keepalive_connections: int = Field(default=20, env="VERA_MAX_KEEPALIVE_CONNECTIONS")
+    vera_keepalive_expiry: float = Field(default=30.0, env="VERA_KEEPALIVE_EXPIRY")
+    vera_streaming: bool = Field(default=True, env="VERA_STREAMING")
+    vera_stream_edit_interval: float = Field(default=1.5, env="VERA_STREAM_EDIT_INTERVAL")
+    vera_stream_max_chars: int = Field(default=16_000, env="VERA_STREAM_MAX_CHARS")
+    vera_per_claim: bool = Field(default=True, env="VERA_PER_CLAIM")
+    vera_claim_concurrency: int = Field(default=4, env="VERA_CLAIM_CONCURRENCY")
+    vera_claim_timeout: float = Field(default=30.0, env="VERA_CLAIM_TIMEOUT")
+    vera_breaker_threshold: int = Field(default=5, env="VERA_BREAKER_THRESHOLD")
+    vera_breaker_recovery: float = Field(default=30.0, env="VERA_BREAKER_RECOVERY")
+    vera_retry_attempts: int = Field(default=3, env="VERA_RETRY_ATTEMPTS")
+    vera_retry_base_delay: float = Field(default=0.5, env="VERA_RETRY_BASE_DELAY")
+    vera_retry_max_delay: float = Field(default=4.0, env="VERA_RETRY_MAX_DELAY")
+    vera_hedge_enabled: bool = Field(default=False, env="VERA_HEDGE_ENABLED")
+    vera_hedge_delay: float = Field(default=3.0, env="VERA_HEDGE_DELAY")
+    vera_hedge_max_chars: int = Field(default=280, env="VERA_HEDGE_MAX_CHARS")
+    
+    fact_check_cache_enabled: bool = Field(default=True, env="FACT_CHECK_CACHE_ENABLED")
+    fact_check_cache_max_entries: int = Field(default=10_000, env="FACT_CHECK_CACHE_MAX_ENTRIES")
+    fact_check_cache_ttl_seconds: int = Field(default=6 * 3600, env="FACT_CHECK_CACHE_TTL_SECONDS")
+    fact_check_cache_db_path: Optional[Path] = Field(default=None, env="FACT_CHECK_CACHE_DB_PATH")
+    fact_check_cache_db_max_entries: int = Field(default=100_000, env="FACT_CHECK_CACHE_DB_MAX_ENTRIES")
+    
+    claim_index_enabled: bool = Field(default=True, env="CLAIM_INDEX_ENABLED")
+    claim_index_max_entries: int = Field(default=200_000, env="CLAIM_INDEX_MAX_ENTRIES")
+    claim_index_ttl_seconds: int = Field(default=6 * 3600, env="CLAIM_INDEX_TTL_SECONDS")
+    claim_index_max_distance: int = Field(default=3, env="CLAIM_INDEX_MAX_DISTANCE")
+    
+    claim_prefilter_enabled: bool = Field(default=True, env="CLAIM_PREFILTER_ENABLED")
+    claim_prefilter_shortcut_enabled: bool = Field(default=True, env="CLAIM_PREFILTER_SHORTCUT_ENABLED")
+    claim_prefilter_shortcut_max_words: int = Field(default=20, env="CLAIM_PREFILTER_SHORTCUT_MAX_WORDS")
+    
+    media_dedup_enabled: bool = Field(default=True, env="MEDIA_DEDUP_ENABLED")
+    media_dedup_max_entries: int = Field(default=5_000, env="MEDIA_DEDUP_MAX_ENTRIES")
+    media_dedup_ttl_seconds: int = Field(default=24 * 3600, env="MEDIA_DEDUP_TTL_SECONDS")
+    
+    scheduler_enabled: bool = Field(default=True, env="SCHEDULER_ENABLED")
+    scheduler_text_limit: int = Field(default=16, env="SCHEDULER_TEXT_LIMIT")
+    scheduler_link_limit: int = Field(default=8, env="SCHEDULER_LINK_LIMIT")
+    scheduler_image_limit: int = Field(default=8, env="SCHEDULER_IMAGE_LIMIT")
+    scheduler_audio_limit: int = Field(default=4, env="SCHEDULER_AUDIO_LIMIT")
+    scheduler_video_limit: int = Field(default=2, env="SCHEDULER_VIDEO_LIMIT")
+    scheduler_max_queue: int = Field(default=50, env="SCHEDULER_MAX_QUEUE")
+    
+    rate_limit_enabled: bool = Field(default=True, env="RATE_LIMIT_ENABLED")
+    rate_limit_capacity: float = Field(default=20.0, env="RATE_LIMIT_CAPACITY")
+    rate_limit_refill_per_second: float = Field(default=0.2, env="RATE_LIMIT_REFILL_PER_SECOND")
+    rate_limit_text_cost: float = Field(default=1.0, env="RATE_LIMIT_TEXT_COST")
+    rate_limit_link_cost: float = Field(default=2.0, env="RATE_LIMIT_LINK_COST")
+    rate_limit_image_cost: float = Field(default=3.0, env="RATE_LIMIT_IMAGE_COST")
+    rate_limit_audio_cost: float = Field(default=4.0, env="RATE_LIMIT_AUDIO_COST")
+    rate_limit_video_cost: float = Field(default=10.0, env="RATE_LIMIT_VIDEO_COST")
+    rate_limit_max_users: int = Field(default=200_000, env="RATE_LIMIT_MAX_USERS")
+    rate_limit_global_capacity: float = Field(default=300.0, env="RATE_LIMIT_GLOBAL_CAPACITY")
+    rate_limit_global_refill_per_second: float = Field(default=5.0, env="RATE_LIMIT_GLOBAL_REFILL_PER_SECOND")
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -2,34 +2,38 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 from pathlib import Path
-import uuid
 
-from services.gemini_client import GeminiClient
-from services.vera_client import VeraClient
+from handlers.common import fact_check_with_progress
+from services.resilience import CircuitOpenError
+from services.clients import get_clients
 from config.settings import settings
 from utils.logger import logger
+from utils.metrics import observe_stage
 from utils.formatters import format_fact_check_response, format_error_message, format_processing_message
-from utils.validators import validate_file_size
+from utils.downloads import download_media, discard_media, hash_media
+from utils.validators import ValidationError, validate_size
 
 async def handle_audio(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = str(update.effective_user.id)
     
-    logger.info(f"Audio reçu de {user_id}")
+    logger.info(f"Audio reçu de {user_id}", extra={"event": "message_received"})
     
     processing_msg = await update.message.reply_text(
         format_processing_message("audio"),
         parse_mode=ParseMode.MARKDOWN
     )
     
-    file_path = None
+    media = None
     
     try:
         if update.message.voice:
             audio = update.message.voice
             file_extension = "ogg"
+            mime_type = audio.mime_type or "audio/ogg"
         elif update.message.audio:
             audio = update.message.audio
             file_extension = "mp3"
+            mime_type = audio.mime_type or "audio/mpeg"
         else:
             await processing_msg.edit_text(
                 format_error_message("unsupported_format"),
@@ -37,45 +41,73 @@ async def handle_audio(update: Update, context: ContextTypes.DEFAULT_TYPE):
             )
             return
         
-        file = await context.bot.get_file(audio.file_id)
-        
-        file_path = settings.temp_download_path / f"{uuid.uuid4()}.{file_extension}"
-        await file.download_to_drive(file_path)
-        
         try:
-            validate_file_size(file_path, settings.max_audio_size_mb)
-        except Exception as e:
-            file_path.unlink(missing_ok=True)
+            validate_size(audio.file_size, settings.max_audio_size_mb)
+        except ValidationError as e:
             await processing_msg.edit_text(
                 format_error_message("file_too_large", str(e)),
                 parse_mode=ParseMode.MARKDOWN
             )
             return
         
-        gemini_client = GeminiClient()
-        vera_client = VeraClient()
+        clients = get_clients(context)
         
-        analyzed = gemini_client.analyze_audio(file_path, user_id)
+        duplicate = clients.media_index.get_by_unique_id(audio.file_unique_id) if clients.media_index else None
         
-        file_path.unlink(missing_ok=True)
-        
-        if not analyzed.claims or len(analyzed.claims) == 0:
-            if analyzed.extracted_text:
-                query = analyzed.extracted_text
-            else:
+        if not duplicate:
+            with observe_stage("telegram_get_file"):
+                file = await context.bot.get_file(audio.file_id)
+            
+            try:
+                media = await download_media(clients.files, file, settings.max_audio_size_mb, audio.file_size, file_extension)
+            except ValidationError as e:
                 await processing_msg.edit_text(
-                    format_error_message("no_content", "Aucun contenu détecté dans l'audio."),
+                    format_error_message("file_too_large", str(e)),
                     parse_mode=ParseMode.MARKDOWN
                 )
                 return
-        else:
-            query = "\n".join(analyzed.claims)
+            
+            content_hash = await hash_media(media)
+            duplicate = clients.media_index.get_by_hash(content_hash, audio.file_unique_id) if clients.media_index else None
         
-        vera_response = await vera_client.fact_check(query, user_id)
+        if duplicate:
+            discard_media(media)
+            logger.info(f"Audio déjà analysé, réponse réutilisée pour {user_id}", extra={"event": "cache_hit"})
+            analyzed, vera_response = duplicate.analyzed, duplicate.vera_response
+        else:
+            with observe_stage("media_preprocess"):
+                prepared = await clients.preprocessor.prepare_audio(media, file_extension) if clients.preprocessor else None
+            
+            if prepared:
+                try:
+                    analyzed = await clients.gemini.analyze_audio(prepared.path, user_id, prepared.mime_type)
+                finally:
+                    prepared.discard()
+            else:
+                analyzed = await clients.gemini.analyze_audio(media, user_id, mime_type, content_hash)
+            
+            discard_media(media)
+            
+            vera_response = None
+            query = "\n".join(analyzed.claims) if analyzed.claims else analyzed.extracted_text
+            if query:
+                vera_response = await fact_check_with_progress(
+                    clients.vera, query, user_id, processing_msg, claims=analyzed.claims
+                )
+                
+                if not vera_response.success:
+                    await processing_msg.edit_text(
+                        format_error_message("api_error", vera_response.error_message),
+                        parse_mode=ParseMode.MARKDOWN
+                    )
+                    return
+            
+            if clients.media_index:
+                clients.media_index.remember(analyzed, vera_response, audio.file_unique_id, content_hash)
         
-        if not vera_response.success:
+        if vera_response is None:
             await processing_msg.edit_text(
-                format_error_message("api_error", vera_response.error_message),
+                format_error_message("no_content", "Aucun contenu détecté dans l'audio."),
                 parse_mode=ParseMode.MARKDOWN
             )
             return
@@ -87,18 +119,18 @@ async def handle_audio(update: Update, context: ContextTypes.DEFAULT_TYPE):
             claims=analyzed.claims
         )
         
-        await processing_msg.edit_text(
-            final_response,
-            parse_mode=ParseMode.MARKDOWN
-        )
+        with observe_stage("telegram_edit_text"):
+            await processing_msg.edit_text(
+                final_response,
+                parse_mode=ParseMode.MARKDOWN
+            )
         
         logger.info(f"Analyse audio terminée pour {user_id}")
     
     except Exception as e:
         logger.error(f"Erreur dans handle_audio: {e}")
-        if file_path and file_path.exists():
-            file_path.unlink(missing_ok=True)
+        discard_media(media)
         await processing_msg.edit_text(
-            format_error_message("processing_error", str(e)),
+            format_error_message("unavailable", str(e)) if isinstance(e, CircuitOpenError) else format_error_message("processing_error"),
             parse_mode=ParseMode.MARKDOWN
-        )
\ No newline at end of file
+        )
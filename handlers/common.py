@@ -0,0 +1,59 @@
+from typing import Optional
+from telegram import Message
+from telegram.constants import ParseMode
+
+from config.settings import settings
+from models.content import VeraResponse
+from services.vera_client import VeraClient, merge_claim_responses
+from utils.formatters import format_claim_verdicts
+from utils.progress import ProgressiveEditor
+
+STREAM_HEADER = "⏳ Vérification en cours...\n\n"
+
+async def fact_check_with_progress(
+    vera: VeraClient,
+    query: str,
+    user_id: str,
+    processing_msg: Message,
+    claims: Optional[list[str]] = None
+) -> VeraResponse:
+    if settings.vera_per_claim and claims and len(claims) > 1:
+        return await fact_check_claims_with_progress(vera, claims, user_id, processing_msg)
+    
+    if not settings.vera_streaming:
+        return await vera.fact_check(query, user_id)
+    
+    editor = ProgressiveEditor(processing_msg, settings.vera_stream_edit_interval, STREAM_HEADER)
+    try:
+        return await vera.fact_check(query, user_id, on_partial=editor.update)
+    finally:
+        await editor.close()
+
+async def fact_check_claims_with_progress(
+    vera: VeraClient,
+    claims: list[str],
+    user_id: str,
+    processing_msg: Message
+) -> VeraResponse:
+    responses: list[Optional[VeraResponse]] = [None] * len(claims)
+    editor = ProgressiveEditor(
+        processing_msg,
+        settings.vera_stream_edit_interval,
+        STREAM_HEADER,
+        parse_mode=ParseMode.MARKDOWN
+    )
+    
+    async def on_result(index: int, response: VeraResponse):
+        responses[index] = response
+        await editor.update(format_claim_verdicts(
+            claims,
+            [r.answer if r and r.success else None for r in responses],
+            [r.error_message if r and not r.success else None for r in responses]
+        ))
+    
+    try:
+        await vera.fact_check_claims(claims, user_id, on_result=on_result)
+    finally:
+        await editor.close()
+    
+    return merge_claim_responses(claims, responses)
@@ -2,62 +2,119 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 from pathlib import Path
-import uuid
 
-from services.gemini_client import GeminiClient
-from services.vera_client import VeraClient
+from handlers.common import fact_check_with_progress
+from models.content import AnalyzedContent
+from services.resilience import CircuitOpenError
+from services.clients import ServiceClients, get_clients
 from config.settings import settings
 from utils.logger import logger
+from utils.metrics import observe_stage
 from utils.formatters import format_fact_check_response, format_error_message, format_processing_message
-from utils.validators import validate_file_size
+from utils.downloads import Media, download_media, discard_media, hash_media
+from utils.images import recompress_image, select_photo_size
+from utils.validators import ValidationError, validate_size
+
+async def _analyze_photo(clients: ServiceClients, media: Media, content_hash: str, user_id: str) -> AnalyzedContent:
+    if settings.image_recompress:
+        recompressed = await recompress_image(media, settings.image_max_side, settings.image_jpeg_quality)
+        if recompressed:
+            try:
+                return await clients.gemini.analyze_image(recompressed, user_id, "image/jpeg", content_hash)
+            finally:
+                discard_media(recompressed)
+    return await clients.gemini.analyze_image(media, user_id, "image/jpeg", content_hash)
 
 async def handle_image(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = str(update.effective_user.id)
     
-    logger.info(f"Image reçue de {user_id}")
+    logger.info(f"Image reçue de {user_id}", extra={"event": "message_received"})
     
     processing_msg = await update.message.reply_text(
         format_processing_message("image"),
         parse_mode=ParseMode.MARKDOWN
     )
     
+    media = None
+    
     try:
-        photo = update.message.photo[-1]
-        file = await context.bot.get_file(photo.file_id)
-        
-        file_path = settings.temp_download_path / f"{uuid.uuid4()}.jpg"
-        await file.download_to_drive(file_path)
+        photo = select_photo_size(update.message.photo, settings.image_target_pixels)
         
         try:
-            validate_file_size(file_path, settings.max_image_size_mb)
-        except Exception as e:
-            file_path.unlink(missing_ok=True)
+            validate_size(photo.file_size, settings.max_image_size_mb)
+        except ValidationError as e:
             await processing_msg.edit_text(
                 format_error_message("file_too_large", str(e)),
                 parse_mode=ParseMode.MARKDOWN
             )
             return
         
-        gemini_client = GeminiClient()
-        vera_client = VeraClient()
+        clients = get_clients(context)
         
-        analyzed = gemini_client.analyze_image(file_path, user_id)
+        duplicate = clients.media_index.get_by_unique_id(photo.file_unique_id) if clients.media_index else None
         
-        file_path.unlink(missing_ok=True)
-        
-        if not analyzed.claims or len(analyzed.claims) == 0:
-            await processing_msg.edit_text(
-                format_error_message("no_claims", "Aucune affirmation factuelle détectée dans l'image."),
-                parse_mode=ParseMode.MARKDOWN
-            )
-            return
+        if not duplicate:
+            with observe_stage("telegram_get_file"):
+                file = await context.bot.get_file(photo.file_id)
+            
+            try:
+                media = await download_media(clients.files, file, settings.max_image_size_mb, photo.file_size, "jpg")
+            except ValidationError as e:
+                await processing_msg.edit_text(
+                    format_error_message("file_too_large", str(e)),
+                    parse_mode=ParseMode.MARKDOWN
+                )
+                return
+            
+            content_hash = await hash_media(media)
+            duplicate = clients.media_index.get_by_hash(content_hash, photo.file_unique_id) if clients.media_index else None
         
-        query = "\n".join(analyzed.claims)
-        vera_response = await vera_client.fact_check(query, user_id)
+        if duplicate:
+            discard_media(media)
+            logger.info(f"Image déjà analysée, réponse réutilisée pour {user_id}", extra={"event": "cache_hit"})
+            analyzed, vera_response = duplicate.analyzed, duplicate.vera_response
+        else:
+            analyzed = await _analyze_photo(clients, media, content_hash, user_id)
+            renditions = [(photo.file_unique_id, content_hash)]
+            
+            discard_media(media)
+            
+            largest = update.message.photo[-1]
+            if not analyzed.extracted_text and not analyzed.claims and photo.file_unique_id != largest.file_unique_id:
+                logger.info(f"Aucun texte extrait en {photo.width}x{photo.height}, nouvelle analyse en pleine résolution")
+                try:
+                    with observe_stage("telegram_get_file"):
+                        file = await context.bot.get_file(largest.file_id)
+                    media = await download_media(clients.files, file, settings.max_image_size_mb, largest.file_size, "jpg")
+                    content_hash = await hash_media(media)
+                    analyzed = await _analyze_photo(clients, media, content_hash, user_id)
+                    renditions.append((largest.file_unique_id, content_hash))
+                except ValidationError as e:
+                    logger.info(f"Pleine résolution ignorée: {e}")
+                finally:
+                    discard_media(media)
+            
+            vera_response = None
+            if analyzed.claims:
+                query = "\n".join(analyzed.claims)
+                vera_response = await fact_check_with_progress(
+                    clients.vera, query, user_id, processing_msg, claims=analyzed.claims
+                )
+                
+                if not vera_response.success:
+                    await processing_msg.edit_text(
+                        format_error_message("api_error", vera_response.error_message),
+                        parse_mode=ParseMode.MARKDOWN
+                    )
+                    return
+            
+            if clients.media_index:
+                for file_unique_id, rendition_hash in renditions:
+                    clients.media_index.remember(analyzed, vera_response, file_unique_id, rendition_hash)
         
-        if not vera_response.success:
+        if vera_response is None:
             await processing_msg.edit_text(
-                format_error_message("api_error", vera_response.error_message),
+                format_error_message("no_claims", "Aucune affirmation factuelle détectée dans l'image."),
                 parse_mode=ParseMode.MARKDOWN
             )
             return
@@ -69,18 +126,18 @@ async def handle_image(update: Update, context: ContextTypes.DEFAULT_TYPE):
             claims=analyzed.claims
         )
         
-        await processing_msg.edit_text(
-            final_response,
-            parse_mode=ParseMode.MARKDOWN
-        )
+        with observe_stage("telegram_edit_text"):
+            await processing_msg.edit_text(
+                final_response,
+                parse_mode=ParseMode.MARKDOWN
+            )
         
         logger.info(f"Analyse image terminée pour {user_id}")
     
     except Exception as e:
         logger.error(f"Erreur dans handle_image: {e}")
-        if file_path.exists():
-            file_path.unlink(missing_ok=True)
+        discard_media(media)
         await processing_msg.edit_text(
-            format_error_message("processing_error", str(e)),
+            format_error_message("unavailable", str(e)) if isinstance(e, CircuitOpenError) else format_error_message("processing_error"),
             parse_mode=ParseMode.MARKDOWN
-        )
\ No newline at end of file
+        )
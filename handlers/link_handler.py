@@ -2,9 +2,10 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 
-from services.gemini_client import GeminiClient
-from services.vera_client import VeraClient
+from handlers.common import fact_check_with_progress
+from services.clients import get_clients
 from utils.logger import logger
+from utils.metrics import observe_stage
 from utils.formatters import format_fact_check_response, format_error_message, format_processing_message
 from utils.validators import extract_urls, is_valid_url
 
@@ -22,7 +23,7 @@ async def handle_link(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     url = urls[0]
-    logger.info(f"Lien reçu de {user_id}: {url}")
+    logger.info(f"Lien reçu de {user_id}: {url}", extra={"event": "message_received"})
     
     processing_msg = await update.message.reply_text(
         format_processing_message("lien"),
@@ -30,10 +31,9 @@ async def handle_link(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
     
     try:
-        gemini_client = GeminiClient()
-        vera_client = VeraClient()
+        clients = get_clients(context)
         
-        analyzed = gemini_client.analyze_url(url, user_id)
+        analyzed = await clients.gemini.analyze_url(url, user_id)
         
         if not analyzed.claims or len(analyzed.claims) == 0:
             await processing_msg.edit_text(
@@ -43,7 +43,9 @@ async def handle_link(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return
         
         query = "\n".join(analyzed.claims)
-        vera_response = await vera_client.fact_check(query, user_id)
+        vera_response = await fact_check_with_progress(
+            clients.vera, query, user_id, processing_msg, claims=analyzed.claims
+        )
         
         if not vera_response.success:
             await processing_msg.edit_text(
@@ -59,16 +61,17 @@ async def handle_link(update: Update, context: ContextTypes.DEFAULT_TYPE):
             claims=analyzed.claims
         )
         
-        await processing_msg.edit_text(
-            final_response,
-            parse_mode=ParseMode.MARKDOWN
-        )
+        with observe_stage("telegram_edit_text"):
+            await processing_msg.edit_text(
+                final_response,
+                parse_mode=ParseMode.MARKDOWN
+            )
         
         logger.info(f"Analyse lien terminée pour {user_id}")
     
     except Exception as e:
         logger.error(f"Erreur dans handle_link: {e}")
         await processing_msg.edit_text(
-            format_error_message("processing_error", str(e)),
+            format_error_message("processing_error"),
             parse_mode=ParseMode.MARKDOWN
         )
\ No newline at end of file
@@ -0,0 +1,144 @@
+from functools import wraps
+from typing import Optional
+from telegram import Message, Update
+from telegram.constants import ParseMode
+from telegram.error import TelegramError
+from telegram.ext import ContextTypes
+
+from models.content import ContentType
+from services.clients import get_clients
+from services.scheduler import SchedulerSaturated
+from utils.formatters import format_error_message, format_queue_message
+from utils.logger import logger
+from config.settings import settings
+from utils.metrics import REQUESTS, current_content_type
+from utils.tracing import RequestContext, current_request, record_span
+from utils.validators import extract_urls
+
+def classify_update(update: Update) -> Optional[ContentType]:
+    message = update.message
+    if not message:
+        return None
+    if message.photo:
+        return ContentType.IMAGE
+    if message.video:
+        return ContentType.VIDEO
+    if message.voice or message.audio:
+        return ContentType.AUDIO
+    if message.text:
+        return ContentType.LINK if extract_urls(message.text) else ContentType.TEXT
+    return None
+
+def with_admission(callback):
+    @wraps(callback)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        scheduler = get_clients(context).scheduler
+        content_type = classify_update(update)
+        
+        if not scheduler or not content_type:
+            return await callback(update, context)
+        
+        queue_msg: Optional[Message] = None
+        
+        async def on_queued(position: int):
+            nonlocal queue_msg
+            queue_msg = await update.message.reply_text(
+                format_queue_message(position),
+                parse_mode=ParseMode.MARKDOWN
+            )
+        
+        try:
+            async with scheduler.slot(content_type, on_queued) as waited:
+                record_span("admission_wait", waited)
+                if queue_msg:
+                    try:
+                        await queue_msg.delete()
+                    except TelegramError as e:
+                        logger.debug(f"Suppression du message de file impossible: {e}")
+                return await callback(update, context)
+        
+        except SchedulerSaturated:
+            await update.message.reply_text(
+                format_error_message("overloaded", "Le bot est très sollicité, renvoie ton contenu dans quelques minutes."),
+                parse_mode=ParseMode.MARKDOWN
+            )
+    
+    return wrapper
+
+
+def with_rate_limit(callback):
+    @wraps(callback)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        rate_limiter = get_clients(context).rate_limiter
+        content_type = classify_update(update)
+        
+        if not rate_limiter or not content_type or not update.effective_user:
+            return await callback(update, context)
+        
+        decision = rate_limiter.acquire(update.effective_user.id, content_type)
+        
+        if not decision.allowed:
+            logger.warning(f"Requête {content_type.value} limitée ({decision.scope}) pour {update.effective_user.id}")
+            details = (
+                f"Tu envoies beaucoup de contenus, réessaie dans {decision.retry_after:.0f}s."
+                if decision.scope == "user"
+                else f"Le bot atteint sa capacité maximale, réessaie dans {decision.retry_after:.0f}s."
+            )
+            await update.message.reply_text(
+                format_error_message("rate_limited", details),
+                parse_mode=ParseMode.MARKDOWN
+            )
+            return
+        
+        return await callback(update, context)
+    
+    return wrapper
+
+def with_metrics(callback):
+    @wraps(callback)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        content_type = classify_update(update)
+        if not content_type:
+            return await callback(update, context)
+        
+        REQUESTS.labels(content_type.value).inc()
+        token = current_content_type.set(content_type.value)
+        try:
+            return await callback(update, context)
+        finally:
+            current_content_type.reset(token)
+    
+    return wrapper
+
+def with_request_context(callback):
+    @wraps(callback)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        content_type = classify_update(update)
+        request = RequestContext(
+            update_id=update.update_id,
+            user_id=str(update.effective_user.id) if update.effective_user else None,
+            content_type=content_type.value if content_type else None
+        )
+        token = current_request.set(request)
+        try:
+            return await callback(update, context)
+        finally:
+            elapsed = request.elapsed
+            if elapsed >= settings.slow_request_seconds:
+                logger.warning(
+                    f"Requête lente ({request.content_type}, update {request.update_id}, "
+                    f"utilisateur {request.user_id}): {elapsed:.2f}s | {request.breakdown()}"
+                )
+            else:
+                logger.debug(f"Requête terminée en {elapsed:.2f}s | {request.breakdown()}")
+            current_request.reset(token)
+    
+    return wrapper
+
+def guarded(callback):
+    return with_request_context(with_metrics(with_rate_limit(with_admission(callback))))
+
+async def record_update(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    recorder = get_clients(context).recorder
+    if recorder:
+        recorder.record(update)
@@ -2,9 +2,12 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 
-from services.gemini_client import GeminiClient
-from services.vera_client import VeraClient
+from handlers.common import fact_check_with_progress
+from services.claim_prefilter import CHATTER, CLAIM
+from services.clients import get_clients
+from config.settings import settings
 from utils.logger import logger
+from utils.metrics import observe_stage
 from utils.formatters import format_fact_check_response, format_error_message, format_processing_message
 from utils.validators import extract_urls
 
@@ -12,30 +15,43 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = str(update.effective_user.id)
     text = update.message.text
     
-    logger.info(f"Message texte reçu de {user_id}: {text[:50]}...")
+    logger.info(f"Message texte reçu de {user_id}: {text[:50]}...", extra={"event": "message_received"})
     
     urls = extract_urls(text)
     if urls:
         from handlers.link_handler import handle_link
         return await handle_link(update, context)
     
+    clients = get_clients(context)
+    decision = clients.prefilter.classify(text) if clients.prefilter else None
+    
+    if decision and decision.verdict == CHATTER:
+        logger.info(f"Message sans affirmation de {user_id} ({decision.reason}), analyse ignorée")
+        await update.message.reply_text(
+            format_error_message("no_claims", "Envoie-moi une affirmation, une image, une vidéo ou un lien à vérifier."),
+            parse_mode=ParseMode.MARKDOWN
+        )
+        return
+    
     processing_msg = await update.message.reply_text(
         format_processing_message("texte"),
         parse_mode=ParseMode.MARKDOWN
     )
     
     try:
-        gemini_client = GeminiClient()
-        vera_client = VeraClient()
-        
-        analyzed = gemini_client.analyze_text(text, user_id)
+        if decision and decision.verdict == CLAIM and settings.claim_prefilter_shortcut_enabled:
+            analyzed = clients.prefilter.as_analysis(text, user_id)
+        else:
+            analyzed = await clients.gemini.analyze_text(text, user_id)
         
         if not analyzed.claims or len(analyzed.claims) == 0:
             query = text
         else:
             query = "\n".join(analyzed.claims)
         
-        vera_response = await vera_client.fact_check(query, user_id)
+        vera_response = await fact_check_with_progress(
+            clients.vera, query, user_id, processing_msg, claims=analyzed.claims
+        )
         
         if not vera_response.success:
             await processing_msg.edit_text(
@@ -51,16 +67,17 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
             claims=analyzed.claims
         )
         
-        await processing_msg.edit_text(
-            final_response,
-            parse_mode=ParseMode.MARKDOWN
-        )
+        with observe_stage("telegram_edit_text"):
+            await processing_msg.edit_text(
+                final_response,
+                parse_mode=ParseMode.MARKDOWN
+            )
         
         logger.info(f"Réponse envoyée à {user_id}")
     
     except Exception as e:
         logger.error(f"Erreur dans handle_text: {e}")
         await processing_msg.edit_text(
-            format_error_message("processing_error", str(e)),
+            format_error_message("processing_error"),
             parse_mode=ParseMode.MARKDOWN
         )
\ No newline at end of file
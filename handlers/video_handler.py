@@ -2,64 +2,101 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 from pathlib import Path
-import uuid
 
-from services.gemini_client import GeminiClient
-from services.vera_client import VeraClient
+from handlers.common import fact_check_with_progress
+from services.resilience import CircuitOpenError
+from services.clients import get_clients
 from config.settings import settings
 from utils.logger import logger
+from utils.metrics import observe_stage
 from utils.formatters import format_fact_check_response, format_error_message, format_processing_message
-from utils.validators import validate_file_size
+from utils.downloads import download_media, discard_media, hash_media
+from utils.validators import ValidationError, validate_size
 
 async def handle_video(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = str(update.effective_user.id)
     
-    logger.info(f"Vidéo reçue de {user_id}")
+    logger.info(f"Vidéo reçue de {user_id}", extra={"event": "message_received"})
     
     processing_msg = await update.message.reply_text(
         format_processing_message("vidéo"),
         parse_mode=ParseMode.MARKDOWN
     )
     
-    file_path = None
+    media = None
     
     try:
         video = update.message.video
-        file = await context.bot.get_file(video.file_id)
-        
-        file_path = settings.temp_download_path / f"{uuid.uuid4()}.mp4"
-        await file.download_to_drive(file_path)
         
         try:
-            validate_file_size(file_path, settings.max_video_size_mb)
-        except Exception as e:
-            file_path.unlink(missing_ok=True)
+            validate_size(video.file_size, settings.max_video_size_mb)
+        except ValidationError as e:
             await processing_msg.edit_text(
                 format_error_message("file_too_large", str(e)),
                 parse_mode=ParseMode.MARKDOWN
             )
             return
         
-        gemini_client = GeminiClient()
-        vera_client = VeraClient()
-        
-        analyzed = gemini_client.analyze_video(file_path, user_id)
+        clients = get_clients(context)
         
-        file_path.unlink(missing_ok=True)
+        duplicate = clients.media_index.get_by_unique_id(video.file_unique_id) if clients.media_index else None
         
-        if not analyzed.claims or len(analyzed.claims) == 0:
-            await processing_msg.edit_text(
-                format_error_message("no_claims", "Aucune affirmation factuelle détectée dans la vidéo."),
-                parse_mode=ParseMode.MARKDOWN
-            )
-            return
+        if not duplicate:
+            with observe_stage("telegram_get_file"):
+                file = await context.bot.get_file(video.file_id)
+            
+            try:
+                media = await download_media(clients.files, file, settings.max_video_size_mb, video.file_size, "mp4")
+            except ValidationError as e:
+                await processing_msg.edit_text(
+                    format_error_message("file_too_large", str(e)),
+                    parse_mode=ParseMode.MARKDOWN
+                )
+                return
+            
+            content_hash = await hash_media(media)
+            duplicate = clients.media_index.get_by_hash(content_hash, video.file_unique_id) if clients.media_index else None
         
-        query = "\n".join(analyzed.claims)
-        vera_response = await vera_client.fact_check(query, user_id)
+        if duplicate:
+            discard_media(media)
+            logger.info(f"Vidéo déjà analysée, réponse réutilisée pour {user_id}", extra={"event": "cache_hit"})
+            analyzed, vera_response = duplicate.analyzed, duplicate.vera_response
+        else:
+            with observe_stage("media_preprocess"):
+                prepared = await clients.preprocessor.prepare_video(media, settings.video_preprocess_mode) if clients.preprocessor else None
+            
+            if prepared:
+                try:
+                    analyzed = await clients.gemini.analyze_video(
+                        prepared.video, user_id, prepared.mime_type, keyframes=prepared.keyframes
+                    )
+                finally:
+                    prepared.discard()
+            else:
+                analyzed = await clients.gemini.analyze_video(media, user_id, video.mime_type or "video/mp4", content_hash)
+            
+            discard_media(media)
+            
+            vera_response = None
+            if analyzed.claims:
+                query = "\n".join(analyzed.claims)
+                vera_response = await fact_check_with_progress(
+                    clients.vera, query, user_id, processing_msg, claims=analyzed.claims
+                )
+                
+                if not vera_response.success:
+                    await processing_msg.edit_text(
+                        format_error_message("api_error", vera_response.error_message),
+                        parse_mode=ParseMode.MARKDOWN
+                    )
+                    return
+            
+            if clients.media_index:
+                clients.media_index.remember(analyzed, vera_response, video.file_unique_id, content_hash)
         
-        if not vera_response.success:
+        if vera_response is None:
             await processing_msg.edit_text(
-                format_error_message("api_error", vera_response.error_message),
+                format_error_message("no_claims", "Aucune affirmation factuelle détectée dans la vidéo."),
                 parse_mode=ParseMode.MARKDOWN
             )
             return
@@ -71,18 +108,18 @@ async def handle_video(update: Update, context: ContextTypes.DEFAULT_TYPE):
             claims=analyzed.claims
         )
         
-        await processing_msg.edit_text(
-            final_response,
-            parse_mode=ParseMode.MARKDOWN
-        )
+        with observe_stage("telegram_edit_text"):
+            await processing_msg.edit_text(
+                final_response,
+                parse_mode=ParseMode.MARKDOWN
+            )
         
         logger.info(f"Analyse vidéo terminée pour {user_id}")
     
     except Exception as e:
         logger.error(f"Erreur dans handle_video: {e}")
-        if file_path and file_path.exists():
-            file_path.unlink(missing_ok=True)
+        discard_media(media)
         await processing_msg.edit_text(
-            format_error_message("processing_error", str(e)),
+            format_error_message("unavailable", str(e)) if isinstance(e, CircuitOpenError) else format_error_message("processing_error"),
             parse_mode=ParseMode.MARKDOWN
-        )
\ No newline at end of file
+        )
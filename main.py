@@ -1,14 +1,19 @@
+from typing import Optional
 from telegram import Update
 from telegram.ext import (
     Application,
+    ApplicationBuilder,
     CommandHandler,
     MessageHandler,
+    TypeHandler,
     filters,
     ContextTypes
 )
 
 from config.settings import settings
 from handlers import handle_text, handle_image, handle_video, handle_audio
+from handlers.middleware import guarded, record_update
+from services.clients import init_clients, close_clients, scheduler_capacity
 from utils.logger import logger
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -66,23 +71,67 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE):
             parse_mode="Markdown"
         )
 
-def main():
-    logger.info("Démarrage du bot Telegram Fact-Checker...")
-    
-    application = Application.builder().token(settings.telegram_bot_token).build()
+ALLOWED_UPDATES = [Update.MESSAGE]
+
+def register_handlers(application: Application):
+    if settings.update_recording_enabled:
+        application.add_handler(TypeHandler(Update, record_update), group=-1)
     
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
     
-    application.add_handler(MessageHandler(filters.PHOTO, handle_image))
-    application.add_handler(MessageHandler(filters.VIDEO, handle_video))
-    application.add_handler(MessageHandler(filters.VOICE | filters.AUDIO, handle_audio))
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text))
+    application.add_handler(MessageHandler(filters.PHOTO, guarded(handle_image)))
+    application.add_handler(MessageHandler(filters.VIDEO, guarded(handle_video)))
+    application.add_handler(MessageHandler(filters.VOICE | filters.AUDIO, guarded(handle_audio)))
+    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, guarded(handle_text)))
     
     application.add_error_handler(error_handler)
+
+def concurrent_updates() -> int:
+    required = scheduler_capacity()
+    if settings.concurrent_updates < required:
+        logger.warning(
+            f"CONCURRENT_UPDATES={settings.concurrent_updates} inférieur à la capacité du planificateur "
+            f"({required} requêtes actives ou en file), relevé à {required}"
+        )
+        return required
+    return settings.concurrent_updates
+
+def build_application(builder: Optional[ApplicationBuilder] = None) -> Application:
+    builder = builder or Application.builder().token(settings.telegram_bot_token)
+    application = (
+        builder
+        .concurrent_updates(concurrent_updates())
+        .post_init(init_clients)
+        .post_shutdown(close_clients)
+        .build()
+    )
+    register_handlers(application)
+    return application
+
+def main():
+    logger.info("Démarrage du bot Telegram Fact-Checker...")
+    
+    application = build_application()
     
-    logger.info("Bot démarré avec succès ! En attente de messages...")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    if settings.telegram_mode == "webhook":
+        if not settings.webhook_url:
+            raise ValueError("WEBHOOK_URL est requis en mode webhook")
+        if not settings.webhook_secret_token:
+            raise ValueError("WEBHOOK_SECRET_TOKEN est requis en mode webhook")
+        logger.info(f"Bot démarré en mode webhook sur {settings.webhook_listen}:{settings.webhook_port}/{settings.webhook_path}")
+        application.run_webhook(
+            listen=settings.webhook_listen,
+            port=settings.webhook_port,
+            url_path=settings.webhook_path,
+            webhook_url=f"{settings.webhook_url.rstrip('/')}/{settings.webhook_path}",
+            secret_token=settings.webhook_secret_token,
+            max_connections=settings.webhook_max_connections,
+            allowed_updates=ALLOWED_UPDATES
+        )
+    else:
+        logger.info("Bot démarré avec succès ! En attente de messages...")
+        application.run_polling(allowed_updates=ALLOWED_UPDATES)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
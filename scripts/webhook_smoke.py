@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import socket
+import time
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "0:smoke")
+os.environ.setdefault("GEMINI_API_KEY", "smoke")
+os.environ.setdefault("VERA_API_KEY", "smoke")
+os.environ.setdefault("VERA_API_URL", "http://vera.invalid/check")
+
+import httpx
+from telegram.ext import Application
+
+from benchmarks.bench_pipeline import install_fakes
+from benchmarks.fakes import FakeTelegramRequest, LatencyProfile
+from config.settings import settings
+from main import ALLOWED_UPDATES, build_application
+
+SECRET_TOKEN = "smoke-secret"
+
+_update_ids = itertools.count(int(time.time()))
+
+def synthetic_text_update(chat_id: int, text: str) -> dict:
+    update_id = next(_update_ids)
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private", "first_name": "Smoke"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Smoke"},
+            "text": text
+        }
+    }
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def post_update(client: httpx.AsyncClient, url: str, secret_token: str, update: dict) -> tuple[int, float]:
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret_token} if secret_token else {}
+    start = time.perf_counter()
+    response = await client.post(url, json=update, headers=headers)
+    return response.status_code, time.perf_counter() - start
+
+async def wait_for_replies(telegram: FakeTelegramRequest, expected: int, timeout: float) -> int:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if telegram.calls["editMessageText"] >= expected:
+            break
+        await asyncio.sleep(0.05)
+    return telegram.calls["editMessageText"]
+
+async def run(count: int, text: str, timeout: float) -> bool:
+    rng = random.Random(0)
+    files: dict[str, bytes] = {}
+    telegram = FakeTelegramRequest(LatencyProfile(0.05, 0.02, 0.0), rng, files)
+    builder = Application.builder().token(settings.telegram_bot_token).request(telegram).get_updates_request(telegram)
+    application = build_application(builder)
+    
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/{settings.webhook_path}"
+    
+    await application.initialize()
+    _, vera = await install_fakes(
+        application, files,
+        gemini=LatencyProfile(0.2, 0.05, 0.0),
+        upload=LatencyProfile(0.1, 0.02, 0.0),
+        vera=LatencyProfile(0.3, 0.1, 0.0),
+        vera_streaming=False,
+        keep_cache=False,
+        rng=rng
+    )
+    await application.updater.start_webhook(
+        listen="127.0.0.1",
+        port=port,
+        url_path=settings.webhook_path,
+        webhook_url=url,
+        secret_token=SECRET_TOKEN,
+        allowed_updates=ALLOWED_UPDATES
+    )
+    await application.start()
+    
+    try:
+        async with httpx.AsyncClient(timeout=10) as client:
+            results = await asyncio.gather(*(
+                post_update(client, url, SECRET_TOKEN, synthetic_text_update(chat_id, text))
+                for chat_id in range(1, count + 1)
+            ))
+            forged, _ = await post_update(client, url, "mauvais-secret", synthetic_text_update(count + 1, text))
+            missing, _ = await post_update(client, url, "", synthetic_text_update(count + 2, text))
+        
+        replies = await wait_for_replies(telegram, count, timeout)
+    finally:
+        await application.updater.stop()
+        await application.stop()
+        await application.shutdown()
+    
+    statuses = [status for status, _ in results]
+    latencies = sorted(latency for _, latency in results)
+    print(f"{count} updates postées sur {url}")
+    print(f"HTTP 200 : {statuses.count(200)}/{count}")
+    print(f"Latence d'acquittement p50 / max : {latencies[len(latencies) // 2] * 1000:.1f}ms / {latencies[-1] * 1000:.1f}ms")
+    print(f"Secret invalide -> HTTP {forged}, secret absent -> HTTP {missing} (attendu 403)")
+    print(f"Réponses envoyées : {replies}/{count}, appels Vera : {sum(vera.calls.values())}, webhook enregistré : {telegram.calls['setWebhook']}")
+    
+    return (
+        all(status == 200 for status in statuses)
+        and forged == 403
+        and missing == 403
+        and replies >= count
+        and sum(telegram.error_replies.values()) == 0
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Lance le bot en mode webhook hors ligne et lui poste des updates synthétiques")
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--text", default="La tour Eiffel mesure 330 mètres.")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Attente maximale des réponses du bot (s)")
+    args = parser.parse_args()
+    ok = asyncio.run(run(args.count, args.text, args.timeout))
+    print("OK" if ok else "ÉCHEC")
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from services.gemini_client import GeminiClient
 from services.vera_client import VeraClient
+from services.clients import ServiceClients, create_clients, get_clients
 
-__all__ = ['GeminiClient', 'VeraClient']
\ No newline at end of file
+__all__ = ['GeminiClient', 'VeraClient', 'ServiceClients', 'create_clients', 'get_clients']
\ No newline at end of file
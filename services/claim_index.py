@@ -0,0 +1,201 @@
+import hashlib
+import re
+import sys
+import time
+import unicodedata
+import zlib
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+FINGERPRINT_BITS = 64
+
+_TOKEN = re.compile(r"\w+")
+_COMBINING = re.compile(r"[\u0300-\u036f]")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+
+STOPWORDS = {
+    "le", "la", "les", "l", "un", "une", "des", "de", "du", "d", "au", "aux", "a", "et", "ou",
+    "en", "dans", "sur", "par", "pour", "avec", "que", "qu", "qui", "ce", "c", "cet", "cette",
+    "ces", "se", "s", "son", "sa", "ses", "leur", "leurs", "y", "il", "elle", "ils", "elles",
+    "on", "est", "sont", "vraiment", "bien", "tres", "deja", "aussi", "alors", "donc", "the",
+    "of", "is", "are", "and", "to", "in", "that", "it", "apparemment", "parait", "paraitrait",
+    "semble", "semblerait", "visiblement", "selon", "urgent", "attention", "info", "partagez",
+    "partager", "breaking", "rt"
+}
+
+NEGATIONS = {"ne", "n", "pas", "jamais", "aucun", "aucune", "rien", "plus", "non", "not", "no", "never", "sans"}
+
+@dataclass
+class ClaimMatch:
+    key: str
+    distance: int
+    age: float
+
+_SPREAD = [sum(((byte >> bit) & 1) << (16 * bit) for bit in range(8)) for byte in range(256)]
+
+def fold(text: str) -> str:
+    return _COMBINING.sub("", unicodedata.normalize("NFKD", text.casefold()))
+
+def claim_tokens(text: str) -> list[str]:
+    return _TOKEN.findall(fold(text))
+
+def claim_guard(text: str, tokens: list[str]) -> int:
+    numbers = sorted({number.replace(",", ".") for number in _NUMBER.findall(text)})
+    negated = sorted(NEGATIONS.intersection(tokens))
+    return zlib.crc32(" ".join(numbers + ["|"] + negated).encode())
+
+def stem(token: str) -> str:
+    return token.rstrip("sx") if len(token) > 3 and not token.isdigit() else token
+
+def content_words(tokens: list[str]) -> list[str]:
+    return [stem(token) for token in tokens if token not in STOPWORDS and token not in NEGATIONS]
+
+def claim_shingles(words: list[str]) -> set[str]:
+    shingles = set(words)
+    shingles.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    return shingles
+
+def word_order(words: list[str]) -> tuple[int, int]:
+    return zlib.crc32(" ".join(sorted(set(words))).encode()), zlib.crc32(" ".join(words).encode())
+
+@lru_cache(maxsize=1 << 16)
+def feature_lanes(feature: str) -> int:
+    digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+    return sum(_SPREAD[byte] << (128 * position) for position, byte in enumerate(digest))
+
+def simhash(features: set[str]) -> int:
+    if not features:
+        return 0
+    counts = array("H", sum(map(feature_lanes, features)).to_bytes(16 * 8, sys.byteorder))
+    majority = len(features) / 2
+    return sum(1 << bit for bit, count in enumerate(counts) if count > majority)
+
+def band_bounds(bands: int) -> list[tuple[int, int]]:
+    width, extra = divmod(FINGERPRINT_BITS, bands)
+    bounds = []
+    start = 0
+    for band in range(bands):
+        size = width + (1 if band < extra else 0)
+        bounds.append((start, (1 << size) - 1))
+        start += size
+    return bounds
+
+class ClaimIndex:
+    def __init__(self, max_entries: int, ttl_seconds: float, max_distance: int = 3, min_shingles: int = 5):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = max_distance
+        self.min_shingles = min_shingles
+        self.bands = band_bounds(max_distance + 1)
+        self._fingerprints = array("Q", bytes(8 * max_entries))
+        self._guards = array("I", bytes(4 * max_entries))
+        self._bags = array("I", bytes(4 * max_entries))
+        self._orders = array("I", bytes(4 * max_entries))
+        self._created = array("d", bytes(8 * max_entries))
+        self._keys: list[Optional[str]] = [None] * max_entries
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in self.bands]
+        self._cursor = 0
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.evictions = 0
+        self.candidates = 0
+    
+    def signature(self, query: str) -> Optional[tuple[int, int, int, int]]:
+        tokens = claim_tokens(query)
+        words = content_words(tokens)
+        shingles = claim_shingles(words)
+        if len(shingles) < self.min_shingles:
+            return None
+        return (simhash(shingles), claim_guard(query, tokens), *word_order(words))
+    
+    def _band_keys(self, fingerprint: int) -> list[int]:
+        return [(fingerprint >> shift) & mask for shift, mask in self.bands]
+    
+    def _nearest(self, fingerprint: int, guard: int, bag: int, order: int, now: float) -> Optional[tuple[int, int]]:
+        best: Optional[tuple[int, int]] = None
+        seen = set()
+        for buckets, key in zip(self._buckets, self._band_keys(fingerprint)):
+            for slot in buckets.get(key, ()):
+                if slot in seen:
+                    continue
+                seen.add(slot)
+                if self._guards[slot] != guard or now - self._created[slot] > self.ttl_seconds:
+                    continue
+                if self._bags[slot] == bag and self._orders[slot] != order:
+                    continue
+                distance = (self._fingerprints[slot] ^ fingerprint).bit_count()
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (slot, distance)
+        self.candidates += len(seen)
+        return best
+    
+    def find(self, query: str) -> Optional[ClaimMatch]:
+        signature = self.signature(query)
+        if signature is None:
+            self.skipped += 1
+            return None
+        
+        now = time.time()
+        nearest = self._nearest(*signature, now)
+        if nearest is None:
+            self.misses += 1
+            return None
+        
+        slot, distance = nearest
+        self.hits += 1
+        return ClaimMatch(key=self._keys[slot], distance=distance, age=now - self._created[slot])
+    
+    def add(self, query: str, key: str):
+        signature = self.signature(query)
+        if signature is None:
+            return
+        
+        fingerprint, guard, bag, order = signature
+        now = time.time()
+        nearest = self._nearest(*signature, now)
+        if nearest and nearest[1] == 0:
+            slot = nearest[0]
+            self._keys[slot] = key
+            self._created[slot] = now
+            return
+        
+        slot = self._cursor
+        self._cursor = (self._cursor + 1) % self.max_entries
+        if self._keys[slot] is not None:
+            self._evict(slot)
+        else:
+            self._size += 1
+        
+        self._fingerprints[slot] = fingerprint
+        self._guards[slot] = guard
+        self._bags[slot] = bag
+        self._orders[slot] = order
+        self._created[slot] = now
+        self._keys[slot] = key
+        for buckets, key in zip(self._buckets, self._band_keys(fingerprint)):
+            buckets.setdefault(key, []).append(slot)
+    
+    def _evict(self, slot: int):
+        for buckets, key in zip(self._buckets, self._band_keys(self._fingerprints[slot])):
+            bucket = buckets[key]
+            bucket.remove(slot)
+            if not bucket:
+                del buckets[key]
+        self._keys[slot] = None
+        self.evictions += 1
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "skipped": self.skipped,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "candidates_per_lookup": self.candidates / lookups if lookups else 0.0
+        }
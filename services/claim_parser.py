@@ -0,0 +1,121 @@
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional, List
+from models.content import ClaimType
+
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "extracted_text": {"type": "string"},
+        "language": {"type": "string"},
+        "claims": {"type": "array", "items": {"type": "string"}},
+        "claim_type": {"type": "string"}
+    },
+    "required": ["summary", "claims"]
+}
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+_NUMBERING = re.compile(r"^(?:\d+[.)]|[-*•])\s*")
+_CLAIM_TYPES = {claim_type.value: claim_type for claim_type in ClaimType}
+
+LEGACY_SUMMARY_FIELDS = ("RESUME", "DESCRIPTION", "SUJET")
+LEGACY_TEXT_FIELDS = ("TEXTE_EXTRAIT", "TRANSCRIPTION")
+
+@dataclass
+class ParsedAnalysis:
+    summary: str = ""
+    extracted_text: str = ""
+    language: Optional[str] = None
+    claims: List[str] = field(default_factory=list)
+    claim_type: ClaimType = ClaimType.UNKNOWN
+    kind: Optional[str] = None
+    ok: bool = True
+
+def clean_claims(raw_claims) -> List[str]:
+    claims = []
+    for claim in raw_claims or []:
+        claim = _NUMBERING.sub("", str(claim).strip()).strip()
+        if claim and claim not in claims:
+            claims.append(claim)
+    return claims
+
+def decode_json(raw: str) -> Optional[ParsedAnalysis]:
+    try:
+        data = json.loads(_FENCE.sub("", raw.strip()))
+    except json.JSONDecodeError:
+        return None
+    
+    if not isinstance(data, dict):
+        return None
+    
+    claims = clean_claims(data.get("claims") if isinstance(data.get("claims"), list) else [])
+    claim_type = _CLAIM_TYPES.get(str(data.get("claim_type", "")).lower())
+    
+    return ParsedAnalysis(
+        summary=str(data.get("summary") or "").strip(),
+        extracted_text=str(data.get("extracted_text") or "").strip(),
+        language=data.get("language") or None,
+        claims=claims,
+        claim_type=claim_type or (ClaimType.FACTUAL if claims else ClaimType.UNKNOWN)
+    )
+
+def decode_legacy(raw: str) -> Optional[ParsedAnalysis]:
+    parsed = ParsedAnalysis()
+    recognized = False
+    in_claims = False
+    
+    for line in raw.strip().split('\n'):
+        label, _, value = line.partition(':')
+        label = label.strip().upper()
+        
+        if label in LEGACY_SUMMARY_FIELDS:
+            parsed.summary = value.strip()
+            recognized = True
+        elif label in LEGACY_TEXT_FIELDS:
+            parsed.extracted_text = value.strip()
+            recognized = True
+        elif label == "TYPE":
+            parsed.kind = value.strip()
+            recognized = True
+        elif label == "AFFIRMATIONS":
+            in_claims = True
+            recognized = True
+        elif in_claims and line.strip():
+            parsed.claims.append(line)
+    
+    if not recognized:
+        return None
+    
+    parsed.claims = clean_claims(parsed.claims)
+    parsed.claim_type = ClaimType.FACTUAL if parsed.claims else ClaimType.UNKNOWN
+    return parsed
+
+class ClaimParser:
+    def __init__(self):
+        self.counts = Counter()
+    
+    def parse(self, raw: str, content_type: str) -> ParsedAnalysis:
+        parsed = decode_json(raw)
+        if parsed:
+            self.counts[(content_type, "json")] += 1
+            return parsed
+        
+        parsed = decode_legacy(raw)
+        if parsed:
+            self.counts[(content_type, "legacy")] += 1
+            return parsed
+        
+        self.counts[(content_type, "failed")] += 1
+        return ParsedAnalysis(ok=False)
+    
+    def stats(self) -> dict:
+        stats = {}
+        for (content_type, outcome), count in self.counts.items():
+            stats.setdefault(content_type, {"json": 0, "legacy": 0, "failed": 0})[outcome] = count
+        for counts in stats.values():
+            total = sum(counts.values())
+            counts["failure_rate"] = counts["failed"] / total if total else 0.0
+        return stats
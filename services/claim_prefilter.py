@@ -0,0 +1,120 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+from models.content import AnalyzedContent, ClaimType, ContentType
+
+CHATTER = "chatter"
+CLAIM = "claim"
+UNKNOWN = "unknown"
+
+_WORD = re.compile(r"[\w'’-]+", re.UNICODE)
+_LAUGH = re.compile(r"^(?:(?:ha|he|hi|ah)+d?|x+d|(?:mdr)+|(?:lol)+|ptdr|xptdr|mdrr+|lool+)$")
+_SENTENCE_BREAK = re.compile(r"[.!?;:]\s+\S")
+_URL = re.compile(r"https?://|www\.", re.IGNORECASE)
+
+CHATTER_WORDS = {
+    "salut", "slt", "bonjour", "bjr", "bonsoir", "coucou", "cc", "hello", "hey", "yo", "hi",
+    "merci", "mrc", "thanks", "thx", "beaucoup", "bcp", "infiniment", "encore",
+    "ok", "okay", "oki", "d'accord", "dac", "daccord", "ouais", "oui", "non", "nan", "si",
+    "super", "top", "cool", "génial", "parfait", "nickel", "trop", "bien", "bravo", "excellent",
+    "au", "revoir", "bye", "ciao", "a", "à", "plus", "+", "bientôt", "bonne", "bon", "journée",
+    "soirée", "nuit", "ça", "ca", "va", "vas", "et", "toi", "vous", "tu", "le", "la", "bot",
+    "stp", "svp", "please", "re", "wesh", "bjr", "bsr", "bonjoir", "hola", "oh", "ah", "euh",
+    "hmm", "hum", "ouf", "wow", "waouh", "oups", "désolé", "pardon", "test", "testing"
+}
+
+BOT_WORDS = {"tu", "t'es", "vous", "toi", "bot", "te", "t'as"}
+QUESTION_STARTS = {"tu", "vous", "comment", "qui", "quoi", "pourquoi", "c'est", "t'es", "t'as", "es-tu", "êtes-vous", "ça"}
+
+FACT_VERBS = {
+    "est", "sont", "était", "étaient", "sera", "seront", "a", "ont", "avait", "avaient",
+    "mesure", "mesurent", "pèse", "pèsent", "contient", "contiennent", "cause", "causent",
+    "provoque", "provoquent", "guérit", "guérissent", "soigne", "soignent", "tue", "tuent",
+    "coûte", "coûtent", "vaut", "valent", "compte", "comptent", "possède", "possèdent",
+    "augmente", "augmentent", "baisse", "baissent", "interdit", "interdisent", "oblige",
+    "obligent", "gagné", "perdu", "construit", "construite", "inventé", "découvert", "mort",
+    "morte", "né", "née", "élu", "élue", "signé", "voté", "annoncé", "prouvé", "détruit",
+    "représente", "représentent", "produit", "produisent", "consomme", "consomment"
+}
+
+OPINION_MARKERS = {
+    "pense", "crois", "trouve", "aime", "adore", "déteste", "préfère", "avis", "imo",
+    "meilleur", "meilleure", "pire", "beau", "belle", "moche", "nul", "nulle", "magnifique",
+    "horrible", "incroyable", "ridicule", "honteux", "honteuse", "scandaleux", "génial", "géniale"
+}
+
+REQUEST_MARKERS = {"j'aimerais", "savoir", "vérifie", "vérifier", "vérifiez", "peux", "pouvez", "est-ce", "confirmes"}
+
+@dataclass
+class PrefilterDecision:
+    verdict: str
+    reason: str
+
+def tokenize(text: str) -> list[str]:
+    return [word.lower().replace("’", "'") for word in _WORD.findall(text)]
+
+def has_fact_signal(text: str, words: list[str]) -> bool:
+    return any(char.isdigit() for char in text) or any(word in FACT_VERBS for word in words)
+
+class ClaimPrefilter:
+    def __init__(self, shortcut_max_words: int = 20, shortcut_min_words: int = 4, shortcut_max_words_with_comma: int = 12):
+        self.shortcut_max_words = shortcut_max_words
+        self.shortcut_min_words = shortcut_min_words
+        self.shortcut_max_words_with_comma = shortcut_max_words_with_comma
+        self.decisions = Counter()
+    
+    def classify(self, text: str) -> PrefilterDecision:
+        decision = self._classify(text.strip())
+        self.decisions[f"{decision.verdict}_{decision.reason}"] += 1
+        return decision
+    
+    def _classify(self, text: str) -> PrefilterDecision:
+        if not any(char.isalnum() for char in text):
+            return PrefilterDecision(CHATTER, "no_words")
+        
+        words = tokenize(text)
+        
+        if len(words) <= 5 and all(word in CHATTER_WORDS or _LAUGH.match(word) for word in words):
+            return PrefilterDecision(CHATTER, "small_talk")
+        
+        if _URL.search(text):
+            return PrefilterDecision(UNKNOWN, "url")
+        
+        fact_signal = has_fact_signal(text, words)
+        is_question = text.rstrip().endswith("?")
+        
+        if (
+            is_question
+            and len(words) <= 8
+            and not fact_signal
+            and words[0] in QUESTION_STARTS
+            and any(word in BOT_WORDS for word in words)
+        ):
+            return PrefilterDecision(CHATTER, "question_to_bot")
+        
+        if (
+            not is_question
+            and fact_signal
+            and self.shortcut_min_words <= len(words) <= self.shortcut_max_words
+            and not _SENTENCE_BREAK.search(text)
+            and ("," not in text or len(words) <= self.shortcut_max_words_with_comma)
+            and not any(word in OPINION_MARKERS or word in REQUEST_MARKERS for word in words)
+            and words.count("et") <= 1
+        ):
+            return PrefilterDecision(CLAIM, "single_claim")
+        
+        return PrefilterDecision(UNKNOWN, "needs_analysis")
+    
+    def as_analysis(self, text: str, user_id: str) -> AnalyzedContent:
+        claim = text.strip()
+        return AnalyzedContent(
+            content_type=ContentType.TEXT,
+            user_id=user_id,
+            extracted_text=text,
+            summary=claim[:200],
+            claims=[claim],
+            claim_type=ClaimType.FACTUAL
+        )
+    
+    def stats(self) -> dict:
+        return dict(self.decisions)
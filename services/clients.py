@@ -0,0 +1,208 @@
+import asyncio
+import secrets
+from dataclasses import dataclass
+from typing import Optional
+import httpx
+from telegram.ext import Application, ContextTypes
+from config.settings import settings
+from services.fact_check_cache import FactCheckCache
+from services.gemini_client import GeminiClient
+from services.media_dedup import MediaDedupIndex
+from services.scheduler import AnalysisScheduler
+from services.rate_limiter import TokenBucketLimiter
+from services.media_preprocessor import MediaPreprocessor, VIDEO_MODES
+from services.update_recorder import UpdateRecorder
+from services.claim_prefilter import ClaimPrefilter
+from services.claim_index import ClaimIndex
+from models.content import ContentType
+from services.vera_client import VeraClient
+from utils.logger import logger, log_stats
+from utils.images import check_recompression_available
+from utils.metrics import start_metrics_server
+from utils.profiler import SamplingProfiler
+
+CLIENTS_KEY = "clients"
+
+@dataclass
+class ServiceClients:
+    gemini: GeminiClient
+    vera: VeraClient
+    files: httpx.AsyncClient
+    media_index: Optional[MediaDedupIndex] = None
+    scheduler: Optional[AnalysisScheduler] = None
+    rate_limiter: Optional[TokenBucketLimiter] = None
+    preprocessor: Optional[MediaPreprocessor] = None
+    profiler: Optional[SamplingProfiler] = None
+    recorder: Optional[UpdateRecorder] = None
+    prefilter: Optional[ClaimPrefilter] = None
+    
+    def stats_sources(self) -> dict:
+        sources = {
+            "claim_parser": self.gemini.parser.stats,
+            "gemini_resilience": self.gemini.resilience.stats,
+            "gemini_router": self.gemini.router.stats,
+            "vera_resilience": self.vera.resilience.stats,
+            "logging": log_stats
+        }
+        if self.gemini.uploads:
+            sources["gemini_uploads"] = self.gemini.uploads.stats
+        if self.vera.cache:
+            sources["fact_check_cache"] = self.vera.cache.stats
+        if self.vera.claim_index:
+            sources["claim_index"] = self.vera.claim_index.stats
+        if self.media_index:
+            sources["media_dedup"] = self.media_index.stats
+        if self.scheduler:
+            sources["scheduler"] = self.scheduler.stats
+        if self.rate_limiter:
+            sources["rate_limiter"] = self.rate_limiter.stats
+        if self.recorder:
+            sources["update_recorder"] = self.recorder.stats
+        if self.prefilter:
+            sources["claim_prefilter"] = self.prefilter.stats
+        return sources
+    
+    async def close(self):
+        await self.gemini.close()
+        await self.vera.close()
+        await self.files.aclose()
+        if self.preprocessor:
+            self.preprocessor.close()
+        if self.profiler:
+            self.profiler.stop()
+        if self.recorder:
+            self.recorder.close()
+
+def create_fact_check_cache() -> Optional[FactCheckCache]:
+    if not settings.fact_check_cache_enabled:
+        return None
+    return FactCheckCache(
+        max_entries=settings.fact_check_cache_max_entries,
+        ttl_seconds=settings.fact_check_cache_ttl_seconds,
+        db_path=settings.fact_check_cache_db_path,
+        db_max_entries=settings.fact_check_cache_db_max_entries
+    )
+
+def create_claim_index(cache: Optional[FactCheckCache]) -> Optional[ClaimIndex]:
+    if not settings.claim_index_enabled or not cache:
+        return None
+    return ClaimIndex(
+        max_entries=min(settings.claim_index_max_entries, cache.capacity),
+        ttl_seconds=settings.claim_index_ttl_seconds,
+        max_distance=settings.claim_index_max_distance
+    )
+
+def create_media_index() -> Optional[MediaDedupIndex]:
+    if not settings.media_dedup_enabled:
+        return None
+    return MediaDedupIndex(
+        max_entries=settings.media_dedup_max_entries,
+        ttl_seconds=settings.media_dedup_ttl_seconds
+    )
+
+def scheduler_limits() -> dict[ContentType, int]:
+    return {
+        ContentType.TEXT: settings.scheduler_text_limit,
+        ContentType.LINK: settings.scheduler_link_limit,
+        ContentType.IMAGE: settings.scheduler_image_limit,
+        ContentType.AUDIO: settings.scheduler_audio_limit,
+        ContentType.VIDEO: settings.scheduler_video_limit
+    }
+
+def scheduler_capacity() -> int:
+    if not settings.scheduler_enabled:
+        return 0
+    limits = scheduler_limits()
+    return sum(limits.values()) + len(limits) * settings.scheduler_max_queue
+
+def create_scheduler() -> Optional[AnalysisScheduler]:
+    if not settings.scheduler_enabled:
+        return None
+    return AnalysisScheduler(limits=scheduler_limits(), max_queue=settings.scheduler_max_queue)
+
+def create_rate_limiter() -> Optional[TokenBucketLimiter]:
+    if not settings.rate_limit_enabled:
+        return None
+    return TokenBucketLimiter(
+        capacity=settings.rate_limit_capacity,
+        refill_per_second=settings.rate_limit_refill_per_second,
+        costs={
+            ContentType.TEXT: settings.rate_limit_text_cost,
+            ContentType.LINK: settings.rate_limit_link_cost,
+            ContentType.IMAGE: settings.rate_limit_image_cost,
+            ContentType.AUDIO: settings.rate_limit_audio_cost,
+            ContentType.VIDEO: settings.rate_limit_video_cost
+        },
+        max_users=settings.rate_limit_max_users,
+        global_capacity=settings.rate_limit_global_capacity,
+        global_refill_per_second=settings.rate_limit_global_refill_per_second
+    )
+
+def create_preprocessor() -> Optional[MediaPreprocessor]:
+    video_enabled = settings.video_preprocess_mode in VIDEO_MODES and settings.video_preprocess_mode != "off"
+    if settings.video_preprocess_mode not in VIDEO_MODES:
+        logger.warning(f"VIDEO_PREPROCESS_MODE inconnu: {settings.video_preprocess_mode}, prétraitement vidéo désactivé")
+    if not video_enabled and not settings.audio_preprocess_enabled:
+        return None
+    return MediaPreprocessor(workers=settings.media_preprocess_workers)
+
+def create_profiler() -> Optional[SamplingProfiler]:
+    if not settings.profiler_enabled:
+        return None
+    return SamplingProfiler(
+        interval=settings.profiler_interval_ms / 1000,
+        dump_interval=settings.profiler_dump_interval,
+        output_path=settings.profiler_output_path
+    )
+
+def create_recorder() -> Optional[UpdateRecorder]:
+    if not settings.update_recording_enabled:
+        return None
+    return UpdateRecorder(
+        path=settings.update_recording_path,
+        salt=settings.update_recording_salt or secrets.token_hex(16),
+        keep_text=settings.update_recording_keep_text
+    )
+
+def create_prefilter() -> Optional[ClaimPrefilter]:
+    if not settings.claim_prefilter_enabled:
+        return None
+    return ClaimPrefilter(shortcut_max_words=settings.claim_prefilter_shortcut_max_words)
+
+def create_clients() -> ServiceClients:
+    cache = create_fact_check_cache()
+    return ServiceClients(
+        gemini=GeminiClient(),
+        vera=VeraClient(cache=cache, claim_index=create_claim_index(cache)),
+        files=httpx.AsyncClient(timeout=settings.telegram_download_timeout),
+        media_index=create_media_index(),
+        scheduler=create_scheduler(),
+        rate_limiter=create_rate_limiter(),
+        preprocessor=create_preprocessor(),
+        profiler=create_profiler(),
+        recorder=create_recorder(),
+        prefilter=create_prefilter()
+    )
+
+def get_clients(context: ContextTypes.DEFAULT_TYPE) -> ServiceClients:
+    return context.application.bot_data[CLIENTS_KEY]
+
+async def init_clients(application: Application):
+    clients = create_clients()
+    application.bot_data[CLIENTS_KEY] = clients
+    logger.info("Clients partagés initialisés")
+    
+    check_recompression_available(settings.image_recompress)
+    
+    if clients.profiler:
+        clients.profiler.start()
+    
+    if settings.metrics_enabled:
+        start_metrics_server(settings.metrics_port, settings.metrics_addr, clients.stats_sources(), asyncio.get_running_loop())
+        logger.info(f"Métriques Prometheus exposées sur {settings.metrics_addr}:{settings.metrics_port}/metrics")
+
+async def close_clients(application: Application):
+    clients = application.bot_data.pop(CLIENTS_KEY, None)
+    if clients:
+        await clients.close()
+        logger.info("Clients partagés fermés")
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from utils.logger import logger
+from models.content import VeraResponse
+
+_WHITESPACE = re.compile(r"\s+")
+_BULLET = re.compile(r"^(?:[-*•]|\d+[.)])\s*")
+
+def normalize_query(query: str) -> str:
+    claims = set()
+    for line in query.splitlines():
+        line = _WHITESPACE.sub(" ", line).strip()
+        line = _BULLET.sub("", line).casefold()
+        if line:
+            claims.add(line)
+    return "\n".join(sorted(claims))
+
+@dataclass
+class CacheEntry:
+    response: VeraResponse
+    created_at: float
+    
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+class SQLiteFactCheckStore:
+    def __init__(self, db_path: Path, max_entries: int, ttl_seconds: float, prune_margin: float = 0.1):
+        db_path.parent.mkdir(exist_ok=True, parents=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.prune_threshold = max_entries + max(1, int(max_entries * prune_margin))
+        self.prunes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fact_checks ("
+            "key TEXT PRIMARY KEY, answer TEXT NOT NULL, sources TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_fact_checks_created ON fact_checks(created_at)")
+        self._conn.commit()
+        self._rows = self._count()
+    
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM fact_checks").fetchone()[0]
+    
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer, sources, created_at FROM fact_checks WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        answer, sources, created_at = row
+        return CacheEntry(
+            response=VeraResponse(success=True, answer=answer, sources=json.loads(sources)),
+            created_at=created_at
+        )
+    
+    def set(self, key: str, entry: CacheEntry):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fact_checks (key, answer, sources, created_at) VALUES (?, ?, ?, ?)",
+                (key, entry.response.answer, json.dumps(entry.response.sources), entry.created_at)
+            )
+            self._rows += 1
+            if self._rows > self.prune_threshold:
+                self._prune()
+            self._conn.commit()
+    
+    def _prune(self):
+        self._conn.execute("DELETE FROM fact_checks WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        self._conn.execute(
+            "DELETE FROM fact_checks WHERE created_at <= ("
+            "SELECT created_at FROM fact_checks ORDER BY created_at DESC LIMIT 1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self._rows = self._count()
+        self.prunes += 1
+    
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM fact_checks WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self._conn.commit()
+            self._rows = self._count()
+        return cursor.rowcount
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class FactCheckCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, db_path: Optional[Path] = None, db_max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._store = SQLiteFactCheckStore(db_path, db_max_entries, ttl_seconds) if db_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+        if self._store:
+            purged = self._store.purge_expired()
+            logger.info(f"Cache fact-check SQLite ouvert: {db_path} ({purged} entrées expirées supprimées)")
+    
+    def _is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age <= self.ttl_seconds
+    
+    def _remember(self, key: str, entry: CacheEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    async def get_entry(self, query: str) -> Optional[CacheEntry]:
+        entry = await self.get_entry_by_key(normalize_query(query))
+        if entry:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+    
+    async def get_entry_by_key(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        
+        if entry and not self._is_fresh(entry):
+            del self._entries[key]
+            entry = None
+        
+        if entry:
+            self._entries.move_to_end(key)
+            return entry
+        
+        if self._store:
+            entry = await asyncio.to_thread(self._store.get, key)
+            if entry and self._is_fresh(entry):
+                self._remember(key, entry)
+                self.disk_hits += 1
+                return entry
+        
+        return None
+    
+    async def get(self, query: str) -> Optional[VeraResponse]:
+        entry = await self.get_entry(query)
+        return entry.response if entry else None
+    
+    async def set(self, query: str, response: VeraResponse):
+        if not response.success:
+            return
+        key = normalize_query(query)
+        entry = CacheEntry(response=response, created_at=time.time())
+        self._remember(key, entry)
+        if self._store:
+            await asyncio.to_thread(self._store.set, key, entry)
+    
+    @property
+    def capacity(self) -> int:
+        return self._store.max_entries if self._store else self.max_entries
+    
+    def entry_age(self, query: str) -> Optional[float]:
+        entry = self._entries.get(normalize_query(query))
+        return entry.age if entry else None
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        ages = [entry.age for entry in self._entries.values()]
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "oldest_entry_age": max(ages, default=0.0),
+            "newest_entry_age": min(ages, default=0.0),
+            "disk_entries": self._store._rows if self._store else 0,
+            "disk_prunes": self._store.prunes if self._store else 0
+        }
+    
+    def close(self):
+        if self._store:
+            self._store.close()
@@ -1,58 +1,208 @@
+import asyncio
+import time
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Optional, List
 from config.settings import settings
 from utils.logger import logger
+from utils.downloads import Media, hash_media, media_size
+from utils.metrics import GEMINI_ESCALATIONS, GEMINI_MODEL_LATENCY, observe_stage, record_bytes, record_cache
 from models.content import AnalyzedContent, ContentType, ClaimType
+from services.claim_parser import ANALYSIS_SCHEMA, ClaimParser, ParsedAnalysis
+from services.upload_registry import UploadRegistry, RemoteUpload
+from services.resilience import CircuitBreaker, ResilientCaller, RetryPolicy
+from services.model_router import ModelRouter
+
+JSON_INSTRUCTIONS = """Réponds uniquement en JSON avec les champs:
+- "summary": {summary}
+- "extracted_text": {extracted_text}
+- "language": code ISO de la langue du contenu
+- "claims": liste des affirmations factuelles vérifiables, une phrase autonome par élément (liste vide si aucune)
+- "claim_type": "factual", "opinion", "rumor", "question", "mixed" ou "unknown"
+"""
+
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    ConnectionError
+)
+
+def is_retryable(error: BaseException) -> bool:
+    return isinstance(error, RETRYABLE_ERRORS)
+
+def is_upstream_failure(error: BaseException) -> bool:
+    return isinstance(error, (*RETRYABLE_ERRORS, google_exceptions.DeadlineExceeded, TimeoutError))
+
+def create_gemini_resilience() -> ResilientCaller:
+    return ResilientCaller(
+        breaker=CircuitBreaker("Gemini", settings.gemini_breaker_threshold, settings.gemini_breaker_recovery),
+        policy=RetryPolicy(settings.gemini_retry_attempts, settings.gemini_retry_base_delay, settings.gemini_retry_max_delay),
+        is_retryable=is_retryable,
+        is_upstream_failure=is_upstream_failure
+    )
+
+_upload_executor = ThreadPoolExecutor(
+    max_workers=settings.gemini_upload_workers,
+    thread_name_prefix="gemini-upload"
+)
 
 class GeminiClient:
-    def __init__(self):
+    def __init__(self, resilience: Optional[ResilientCaller] = None):
         genai.configure(api_key=settings.gemini_api_key)
         self.model = genai.GenerativeModel(settings.gemini_model)
-        logger.info(f"GeminiClient initialisé avec le modèle: {settings.gemini_model}")
+        self.fast_model = genai.GenerativeModel(settings.gemini_fast_model) if settings.gemini_fast_model else None
+        self.router = ModelRouter(
+            heavy_model=settings.gemini_model,
+            fast_model=settings.gemini_fast_model,
+            fast_content_types=settings.gemini_fast_content_types,
+            fast_max_text_chars=settings.gemini_fast_max_text_chars,
+            fast_max_media_bytes=int(settings.gemini_fast_max_media_mb * 1024 * 1024),
+            escalate_on_empty=settings.gemini_escalate_on_empty
+        )
+        self.generation_config = genai.GenerationConfig(
+            response_mime_type="application/json",
+            response_schema=ANALYSIS_SCHEMA
+        )
+        self.parser = ClaimParser()
+        self.uploads = UploadRegistry(
+            max_entries=settings.gemini_upload_registry_max_entries,
+            ttl_seconds=settings.gemini_upload_registry_ttl_seconds
+        ) if settings.gemini_upload_registry_enabled else None
+        self._inflight_uploads: dict[str, asyncio.Future] = {}
+        self._semaphore = asyncio.Semaphore(settings.gemini_max_concurrency)
+        self.resilience = resilience or create_gemini_resilience()
+        logger.info(f"GeminiClient initialisé avec le modèle: {settings.gemini_model} (rapide: {settings.gemini_fast_model or 'aucun'})")
+    
+    async def close(self):
+        if self.uploads:
+            await self._delete_remote(self.uploads.drain())
+    
+    async def _upload_file(self, media: Media, mime_type: Optional[str]):
+        loop = asyncio.get_running_loop()
+        
+        def upload():
+            if isinstance(media, Path):
+                path = str(media)
+            else:
+                media.seek(0)
+                path = media
+            return loop.run_in_executor(_upload_executor, partial(genai.upload_file, path=path, mime_type=mime_type))
+        
+        with observe_stage("gemini_upload"):
+            remote_file = await self.resilience.call(upload)
+        record_bytes("upload", media_size(media))
+        return remote_file
+    
+    async def _delete_remote(self, uploads: list[RemoteUpload]):
+        loop = asyncio.get_running_loop()
+        for upload in uploads:
+            try:
+                await loop.run_in_executor(_upload_executor, partial(genai.delete_file, upload.name))
+                logger.debug(f"Fichier Gemini supprimé: {upload.name}")
+            except Exception as e:
+                logger.warning(f"Suppression du fichier Gemini {upload.name} impossible: {e}")
+    
+    async def _upload(self, media: Media, mime_type: Optional[str] = None, content_hash: Optional[str] = None):
+        if not self.uploads:
+            return await self._upload_file(media, mime_type)
+        
+        content_hash = content_hash or await hash_media(media)
+        upload, expired = self.uploads.get(content_hash)
+        record_cache("gemini_upload", upload is not None)
+        if expired:
+            asyncio.create_task(self._delete_remote(expired))
+        if upload:
+            logger.info(f"Fichier Gemini réutilisé: {upload.name} ({upload.size} octets économisés)")
+            record_bytes("upload_saved", upload.size)
+            return upload.file
+        
+        inflight = self._inflight_uploads.get(content_hash)
+        if inflight:
+            return await asyncio.shield(inflight)
+        
+        inflight = asyncio.get_running_loop().create_future()
+        self._inflight_uploads[content_hash] = inflight
+        try:
+            remote_file = await self._upload_file(media, mime_type)
+            inflight.set_result(remote_file)
+        except asyncio.CancelledError:
+            inflight.cancel()
+            raise
+        except Exception as e:
+            inflight.set_exception(e)
+            inflight.exception()
+            raise
+        finally:
+            del self._inflight_uploads[content_hash]
+        
+        evicted = self.uploads.put(content_hash, remote_file, media_size(media))
+        if evicted:
+            asyncio.create_task(self._delete_remote(evicted))
+        return remote_file
+    
+    async def _generate(self, contents, model_name: Optional[str] = None):
+        model = self.fast_model if model_name and model_name == self.router.fast_model else self.model
+        async with self._semaphore:
+            with observe_stage("gemini_generate"):
+                return await self.resilience.call(lambda: asyncio.wait_for(
+                    model.generate_content_async(contents, generation_config=self.generation_config),
+                    timeout=settings.gemini_timeout
+                ))
+    
+    async def _analyze_with(self, contents, content_type: ContentType, model_name: str) -> ParsedAnalysis:
+        start = time.perf_counter()
+        try:
+            response = await self._generate(contents, model_name)
+        except Exception:
+            GEMINI_MODEL_LATENCY.labels(model_name, content_type.value, "error").observe(time.perf_counter() - start)
+            raise
+        
+        parsed = self.parser.parse(response.text, content_type.value)
+        outcome = "ok" if parsed.ok and parsed.claims else "no_claims" if parsed.ok else "malformed"
+        GEMINI_MODEL_LATENCY.labels(model_name, content_type.value, outcome).observe(time.perf_counter() - start)
+        if not parsed.ok:
+            logger.warning(f"Réponse Gemini ({model_name}) illisible pour {content_type.value}: {response.text[:200]}")
+        return parsed
+    
+    async def _analyze(self, contents, content_type: ContentType, size: int = 0) -> ParsedAnalysis:
+        model_name = self.router.pick(content_type, size)
+        parsed = await self._analyze_with(contents, content_type, model_name)
+        
+        reason = self.router.escalation_reason(model_name, parsed)
+        if reason:
+            self.router.record_escalation(reason)
+            GEMINI_ESCALATIONS.labels(content_type.value, reason).inc()
+            logger.info(f"Analyse {content_type.value} relancée sur {self.router.heavy_model} ({reason})")
+            parsed = await self._analyze_with(contents, content_type, self.router.heavy_model)
+        
+        return parsed
     
-    def analyze_text(self, text: str, user_id: str) -> AnalyzedContent:
+    async def analyze_text(self, text: str, user_id: str) -> AnalyzedContent:
         prompt = f"""Analyse ce texte et extrait les affirmations factuelles vérifiables.
 
 Texte: {text}
 
-Retourne au format:
-RESUME: [résumé court du contenu]
-AFFIRMATIONS:
-1. [première affirmation factuelle]
-2. [deuxième affirmation factuelle]
-etc.
-
-Si aucune affirmation factuelle, retourne juste le résumé."""
+""" + JSON_INSTRUCTIONS.format(
+            summary="résumé court du contenu",
+            extracted_text="chaîne vide"
+        )
 
         try:
-            response = self.model.generate_content(prompt)
-            result = response.text
-            
-            lines = result.strip().split('\n')
-            summary = ""
-            claims = []
-            
-            in_claims = False
-            for line in lines:
-                if line.startswith('RESUME:'):
-                    summary = line.replace('RESUME:', '').strip()
-                elif line.startswith('AFFIRMATIONS:'):
-                    in_claims = True
-                elif in_claims and line.strip():
-                    claim = line.strip()
-                    if claim[0].isdigit():
-                        claim = claim.split('.', 1)[1].strip() if '.' in claim else claim
-                    if claim:
-                        claims.append(claim)
+            parsed = await self._analyze(prompt, ContentType.TEXT, len(text))
             
             return AnalyzedContent(
                 content_type=ContentType.TEXT,
                 user_id=user_id,
                 extracted_text=text,
-                summary=summary or text[:200],
-                claims=claims,
-                claim_type=ClaimType.FACTUAL if claims else ClaimType.UNKNOWN
+                summary=parsed.summary or text[:200],
+                language=parsed.language,
+                claims=parsed.claims,
+                claim_type=parsed.claim_type
             )
         
         except Exception as e:
@@ -66,201 +216,147 @@ Si aucune affirmation factuelle, retourne juste le résumé."""
                 claim_type=ClaimType.UNKNOWN
             )
     
-    def analyze_image(self, image_path: Path, user_id: str) -> AnalyzedContent:
+    async def analyze_image(
+        self,
+        image: Media,
+        user_id: str,
+        mime_type: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> AnalyzedContent:
         prompt = """Analyse cette image et:
 1. Décris son contenu
 2. Identifie toute affirmation factuelle visible (texte, graphiques, données)
 3. Extrait les affirmations vérifiables
 
-Format de réponse:
-DESCRIPTION: [description de l'image]
-TEXTE_EXTRAIT: [texte visible dans l'image]
-AFFIRMATIONS:
-1. [affirmation 1]
-2. [affirmation 2]"""
+""" + JSON_INSTRUCTIONS.format(
+            summary="description de l'image",
+            extracted_text="texte visible dans l'image"
+        )
 
         try:
-            image_file = genai.upload_file(path=str(image_path))
-            response = self.model.generate_content([prompt, image_file])
-            result = response.text
-            
-            description = ""
-            extracted_text = ""
-            claims = []
-            
-            lines = result.strip().split('\n')
-            in_claims = False
-            
-            for line in lines:
-                if line.startswith('DESCRIPTION:'):
-                    description = line.replace('DESCRIPTION:', '').strip()
-                elif line.startswith('TEXTE_EXTRAIT:'):
-                    extracted_text = line.replace('TEXTE_EXTRAIT:', '').strip()
-                elif line.startswith('AFFIRMATIONS:'):
-                    in_claims = True
-                elif in_claims and line.strip():
-                    claim = line.strip()
-                    if claim[0].isdigit():
-                        claim = claim.split('.', 1)[1].strip() if '.' in claim else claim
-                    if claim:
-                        claims.append(claim)
+            image_file = await self._upload(image, mime_type, content_hash)
+            parsed = await self._analyze([prompt, image_file], ContentType.IMAGE, media_size(image))
             
             return AnalyzedContent(
                 content_type=ContentType.IMAGE,
                 user_id=user_id,
-                extracted_text=extracted_text,
-                summary=description,
-                claims=claims,
-                claim_type=ClaimType.FACTUAL if claims else ClaimType.UNKNOWN
+                extracted_text=parsed.extracted_text,
+                summary=parsed.summary,
+                language=parsed.language,
+                claims=parsed.claims,
+                claim_type=parsed.claim_type
             )
         
         except Exception as e:
             logger.error(f"Erreur analyse image Gemini: {e}")
             raise
     
-    def analyze_video(self, video_path: Path, user_id: str) -> AnalyzedContent:
-        prompt = """Analyse cette vidéo et:
+    async def analyze_video(
+        self,
+        video: Optional[Media],
+        user_id: str,
+        mime_type: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        keyframes: Optional[list[Media]] = None
+    ) -> AnalyzedContent:
+        if keyframes:
+            prompt = """Voici la piste audio d'une vidéo (si présente) suivie d'images clés extraites à intervalles réguliers. Analyse-les et:
+1. Résume le contenu principal de la vidéo
+2. Identifie les affirmations factuelles
+3. Extrait le texte visible ou parlé
+
+"""
+        else:
+            prompt = """Analyse cette vidéo et:
 1. Résume le contenu principal
 2. Identifie les affirmations factuelles
 3. Extrait le texte visible ou parlé
 
-Format:
-RESUME: [résumé de la vidéo]
-AFFIRMATIONS:
-1. [affirmation 1]
-2. [affirmation 2]"""
+"""
+        prompt += JSON_INSTRUCTIONS.format(
+            summary="résumé de la vidéo",
+            extracted_text="texte visible ou parlé"
+        )
 
         try:
-            video_file = genai.upload_file(path=str(video_path))
-            response = self.model.generate_content([prompt, video_file])
-            result = response.text
-            
-            summary = ""
-            claims = []
-            
-            lines = result.strip().split('\n')
-            in_claims = False
-            
-            for line in lines:
-                if line.startswith('RESUME:'):
-                    summary = line.replace('RESUME:', '').strip()
-                elif line.startswith('AFFIRMATIONS:'):
-                    in_claims = True
-                elif in_claims and line.strip():
-                    claim = line.strip()
-                    if claim[0].isdigit():
-                        claim = claim.split('.', 1)[1].strip() if '.' in claim else claim
-                    if claim:
-                        claims.append(claim)
+            uploads = [self._upload(frame, "image/jpeg") for frame in keyframes or []]
+            if video is not None:
+                uploads.insert(0, self._upload(video, mime_type, content_hash))
+            video_files = await asyncio.gather(*uploads)
+            size = sum(media_size(media) for media in [video, *(keyframes or [])] if media is not None)
+            parsed = await self._analyze([prompt, *video_files], ContentType.VIDEO, size)
             
             return AnalyzedContent(
                 content_type=ContentType.VIDEO,
                 user_id=user_id,
-                summary=summary,
-                claims=claims,
-                claim_type=ClaimType.FACTUAL if claims else ClaimType.UNKNOWN
+                extracted_text=parsed.extracted_text or None,
+                summary=parsed.summary,
+                language=parsed.language,
+                claims=parsed.claims,
+                claim_type=parsed.claim_type
             )
         
         except Exception as e:
             logger.error(f"Erreur analyse vidéo Gemini: {e}")
             raise
     
-    def analyze_audio(self, audio_path: Path, user_id: str) -> AnalyzedContent:
+    async def analyze_audio(
+        self,
+        audio: Media,
+        user_id: str,
+        mime_type: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> AnalyzedContent:
         prompt = """Transcris cet audio et:
 1. Extrait le texte parlé
 2. Identifie les affirmations factuelles
 
-Format:
-TRANSCRIPTION: [texte complet]
-AFFIRMATIONS:
-1. [affirmation 1]
-2. [affirmation 2]"""
+""" + JSON_INSTRUCTIONS.format(
+            summary="résumé court de l'audio",
+            extracted_text="transcription complète"
+        )
 
         try:
-            audio_file = genai.upload_file(path=str(audio_path))
-            response = self.model.generate_content([prompt, audio_file])
-            result = response.text
-            
-            transcription = ""
-            claims = []
-            
-            lines = result.strip().split('\n')
-            in_claims = False
-            
-            for line in lines:
-                if line.startswith('TRANSCRIPTION:'):
-                    transcription = line.replace('TRANSCRIPTION:', '').strip()
-                elif line.startswith('AFFIRMATIONS:'):
-                    in_claims = True
-                elif in_claims and line.strip():
-                    claim = line.strip()
-                    if claim[0].isdigit():
-                        claim = claim.split('.', 1)[1].strip() if '.' in claim else claim
-                    if claim:
-                        claims.append(claim)
+            audio_file = await self._upload(audio, mime_type, content_hash)
+            parsed = await self._analyze([prompt, audio_file], ContentType.AUDIO, media_size(audio))
             
             return AnalyzedContent(
                 content_type=ContentType.AUDIO,
                 user_id=user_id,
-                extracted_text=transcription,
-                summary=transcription[:200],
-                claims=claims,
-                claim_type=ClaimType.FACTUAL if claims else ClaimType.UNKNOWN
+                extracted_text=parsed.extracted_text,
+                summary=parsed.summary or parsed.extracted_text[:200],
+                language=parsed.language,
+                claims=parsed.claims,
+                claim_type=parsed.claim_type
             )
         
         except Exception as e:
             logger.error(f"Erreur analyse audio Gemini: {e}")
             raise
     
-    def analyze_url(self, url: str, user_id: str) -> AnalyzedContent:
+    async def analyze_url(self, url: str, user_id: str) -> AnalyzedContent:
         prompt = f"""Analyse ce lien et extrait les informations principales:
 
 URL: {url}
 
-Indique:
-1. Type de contenu (article, vidéo YouTube, etc.)
-2. Sujet principal
-3. Affirmations factuelles clés
+Indique le type de contenu (article, vidéo YouTube, etc.), le sujet principal et les affirmations factuelles clés.
 
-Format:
-TYPE: [type de contenu]
-SUJET: [sujet principal]
-AFFIRMATIONS:
-1. [affirmation 1]
-2. [affirmation 2]"""
+""" + JSON_INSTRUCTIONS.format(
+            summary="type de contenu - sujet principal",
+            extracted_text="chaîne vide"
+        )
 
         try:
-            response = self.model.generate_content(prompt)
-            result = response.text
-            
-            content_type_line = ""
-            subject = ""
-            claims = []
-            
-            lines = result.strip().split('\n')
-            in_claims = False
-            
-            for line in lines:
-                if line.startswith('TYPE:'):
-                    content_type_line = line.replace('TYPE:', '').strip()
-                elif line.startswith('SUJET:'):
-                    subject = line.replace('SUJET:', '').strip()
-                elif line.startswith('AFFIRMATIONS:'):
-                    in_claims = True
-                elif in_claims and line.strip():
-                    claim = line.strip()
-                    if claim[0].isdigit():
-                        claim = claim.split('.', 1)[1].strip() if '.' in claim else claim
-                    if claim:
-                        claims.append(claim)
+            parsed = await self._analyze(prompt, ContentType.LINK, len(url))
             
             return AnalyzedContent(
                 content_type=ContentType.LINK,
                 user_id=user_id,
                 extracted_text=url,
-                summary=f"{content_type_line} - {subject}" if content_type_line else subject,
-                claims=claims,
-                claim_type=ClaimType.FACTUAL if claims else ClaimType.UNKNOWN,
+                summary=f"{parsed.kind} - {parsed.summary}" if parsed.kind else parsed.summary,
+                language=parsed.language,
+                claims=parsed.claims,
+                claim_type=parsed.claim_type,
                 context=url
             )
         
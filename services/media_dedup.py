@@ -0,0 +1,79 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+from models.content import AnalyzedContent, VeraResponse
+from utils.metrics import record_cache
+
+@dataclass
+class DedupEntry:
+    analyzed: AnalyzedContent
+    vera_response: Optional[VeraResponse]
+    created_at: float = field(default_factory=time.time)
+    
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+def unique_id_key(file_unique_id: str) -> str:
+    return f"uid:{file_unique_id}"
+
+def content_hash_key(content_hash: str) -> str:
+    return f"sha256:{content_hash}"
+
+class MediaDedupIndex:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, DedupEntry] = OrderedDict()
+        self.unique_id_hits = 0
+        self.hash_hits = 0
+        self.misses = 0
+    
+    def _lookup(self, key: str) -> Optional[DedupEntry]:
+        entry = self._entries.get(key)
+        if entry and entry.age > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        if entry:
+            self._entries.move_to_end(key)
+        return entry
+    
+    def get_by_unique_id(self, file_unique_id: str) -> Optional[DedupEntry]:
+        entry = self._lookup(unique_id_key(file_unique_id))
+        if entry:
+            self.unique_id_hits += 1
+            record_cache("media_unique_id", True)
+        return entry
+    
+    def get_by_hash(self, content_hash: str, file_unique_id: Optional[str] = None) -> Optional[DedupEntry]:
+        entry = self._lookup(content_hash_key(content_hash))
+        record_cache("media_hash", entry is not None)
+        if not entry:
+            self.misses += 1
+            return None
+        self.hash_hits += 1
+        if file_unique_id:
+            self._put(unique_id_key(file_unique_id), entry)
+        return entry
+    
+    def _put(self, key: str, entry: DedupEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def remember(self, analyzed: AnalyzedContent, vera_response: Optional[VeraResponse], file_unique_id: Optional[str] = None, content_hash: Optional[str] = None):
+        entry = DedupEntry(analyzed=analyzed, vera_response=vera_response)
+        if file_unique_id:
+            self._put(unique_id_key(file_unique_id), entry)
+        if content_hash:
+            self._put(content_hash_key(content_hash), entry)
+    
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "unique_id_hits": self.unique_id_hits,
+            "hash_hits": self.hash_hits,
+            "misses": self.misses
+        }
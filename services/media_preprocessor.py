@@ -0,0 +1,238 @@
+import asyncio
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+import uuid
+from config.settings import settings
+from utils.downloads import Media, media_size
+from utils.logger import logger
+
+VIDEO_MODES = ("off", "downscale", "audio_keyframes")
+
+def run_ffmpeg(args: list[str], timeout: float):
+    subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", *args],
+        check=True,
+        capture_output=True,
+        timeout=timeout
+    )
+
+def transcode_video(source: str, destination: str, max_height: int, video_bitrate: str, audio_bitrate: str, fps: int, timeout: float) -> str:
+    run_ffmpeg([
+        "-i", source,
+        "-vf", f"scale=-2:'min(ih,{max_height})'",
+        "-r", str(fps),
+        "-c:v", "libx264", "-preset", "veryfast", "-b:v", video_bitrate,
+        "-c:a", "aac", "-ac", "1", "-b:a", audio_bitrate,
+        "-movflags", "+faststart",
+        destination
+    ], timeout)
+    return destination
+
+def extract_audio_and_keyframes(source: str, output_dir: str, audio_bitrate: str, interval: float, max_frames: int, max_height: int, timeout: float) -> tuple[Optional[str], list[str]]:
+    output = Path(output_dir)
+    audio_path = output / "audio.ogg"
+    
+    try:
+        run_ffmpeg([
+            "-i", source, "-vn",
+            "-ac", "1", "-ar", "16000",
+            "-c:a", "libopus", "-b:a", audio_bitrate,
+            str(audio_path)
+        ], timeout)
+    except subprocess.CalledProcessError:
+        audio_path = None
+    
+    run_ffmpeg([
+        "-i", source,
+        "-vf", f"fps=1/{interval},scale=-2:'min(ih,{max_height})'",
+        "-frames:v", str(max_frames),
+        "-q:v", "5",
+        str(output / "frame_%03d.jpg")
+    ], timeout)
+    
+    frames = sorted(str(frame) for frame in output.glob("frame_*.jpg"))
+    return (str(audio_path) if audio_path else None), frames
+
+def probe_duration(path: str, timeout: float) -> float:
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return 0.0
+
+def normalize_audio(source: str, destination: str, bitrate: str, silence_threshold_db: int, min_silence: float, timeout: float) -> tuple[float, float]:
+    silence_filter = (
+        f"silenceremove=start_periods=1:start_threshold={silence_threshold_db}dB:start_silence=0.2"
+        f":stop_periods=-1:stop_threshold={silence_threshold_db}dB:stop_duration={min_silence}"
+    )
+    run_ffmpeg([
+        "-i", source, "-vn",
+        "-af", silence_filter,
+        "-ac", "1", "-ar", "16000",
+        "-c:a", "libopus", "-b:a", bitrate, "-application", "voip",
+        destination
+    ], timeout)
+    return probe_duration(source, timeout), probe_duration(destination, timeout)
+
+@dataclass
+class PreparedAudio:
+    path: Path
+    mime_type: str = "audio/ogg"
+    bytes_in: int = 0
+    bytes_out: int = 0
+    seconds_in: float = 0.0
+    seconds_out: float = 0.0
+    elapsed: float = 0.0
+    workdir: Optional[Path] = None
+    
+    def discard(self):
+        if self.workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+@dataclass
+class PreparedVideo:
+    video: Optional[Path]
+    mime_type: str
+    keyframes: list[Path] = field(default_factory=list)
+    bytes_in: int = 0
+    bytes_out: int = 0
+    seconds: float = 0.0
+    workdir: Optional[Path] = None
+    
+    def discard(self):
+        if self.workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+class MediaPreprocessor:
+    def __init__(self, workers: int):
+        self.available = shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        if not self.available:
+            logger.warning("ffmpeg/ffprobe introuvables, le prétraitement des médias est désactivé")
+    
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    def _materialize(self, media: Media, workdir: Path, extension: str) -> Path:
+        if isinstance(media, Path):
+            return media
+        source = workdir / f"source.{extension}"
+        source.write_bytes(media.getbuffer())
+        return source
+    
+    async def prepare_video(self, media: Media, mode: str) -> Optional[PreparedVideo]:
+        if mode not in VIDEO_MODES or mode == "off" or not self.available:
+            return None
+        
+        bytes_in = media_size(media)
+        if bytes_in < settings.video_preprocess_min_mb * 1024 * 1024:
+            return None
+        
+        workdir = Path(tempfile.mkdtemp(prefix="video-", dir=settings.temp_download_path))
+        start = time.perf_counter()
+        
+        try:
+            source = str(await asyncio.to_thread(self._materialize, media, workdir, "mp4"))
+            
+            if mode == "downscale":
+                destination = str(workdir / f"{uuid.uuid4()}.mp4")
+                await self._run(
+                    transcode_video, source, destination,
+                    settings.video_max_height, settings.video_bitrate, settings.video_audio_bitrate,
+                    settings.video_fps, settings.media_preprocess_timeout
+                )
+                prepared = PreparedVideo(video=Path(destination), mime_type="video/mp4")
+            else:
+                audio_path, frames = await self._run(
+                    extract_audio_and_keyframes, source, str(workdir),
+                    settings.video_audio_bitrate, settings.video_keyframe_interval,
+                    settings.video_max_keyframes, settings.video_max_height, settings.media_preprocess_timeout
+                )
+                prepared = PreparedVideo(
+                    video=Path(audio_path) if audio_path else None,
+                    mime_type="audio/ogg",
+                    keyframes=[Path(frame) for frame in frames]
+                )
+        except Exception as e:
+            shutil.rmtree(workdir, ignore_errors=True)
+            logger.warning(f"Prétraitement vidéo ({mode}) échoué, envoi du fichier original: {e}")
+            return None
+        
+        prepared.workdir = workdir
+        prepared.bytes_in = bytes_in
+        prepared.bytes_out = sum(path.stat().st_size for path in [prepared.video, *prepared.keyframes] if path)
+        prepared.seconds = time.perf_counter() - start
+        
+        if prepared.bytes_out >= bytes_in or (prepared.video is None and not prepared.keyframes):
+            prepared.discard()
+            logger.info(f"Prétraitement vidéo ({mode}) sans gain, envoi du fichier original")
+            return None
+        
+        logger.info(
+            f"Vidéo prétraitée ({mode}): {bytes_in / 1024 / 1024:.1f}MB -> {prepared.bytes_out / 1024 / 1024:.1f}MB "
+            f"en {prepared.seconds:.1f}s"
+        )
+        return prepared
+
+    
+    async def prepare_audio(self, media: Media, extension: str) -> Optional[PreparedAudio]:
+        if not settings.audio_preprocess_enabled or not self.available:
+            return None
+        
+        bytes_in = media_size(media)
+        if bytes_in < settings.audio_preprocess_min_kb * 1024:
+            return None
+        
+        workdir = Path(tempfile.mkdtemp(prefix="audio-", dir=settings.temp_download_path))
+        start = time.perf_counter()
+        
+        try:
+            source = str(await asyncio.to_thread(self._materialize, media, workdir, extension))
+            destination = workdir / "normalized.ogg"
+            seconds_in, seconds_out = await self._run(
+                normalize_audio, source, str(destination),
+                settings.audio_bitrate, settings.audio_silence_threshold_db,
+                settings.audio_min_silence, settings.media_preprocess_timeout
+            )
+        except Exception as e:
+            shutil.rmtree(workdir, ignore_errors=True)
+            logger.warning(f"Normalisation audio échouée, envoi du fichier original: {e}")
+            return None
+        
+        prepared = PreparedAudio(
+            path=destination,
+            bytes_in=bytes_in,
+            bytes_out=destination.stat().st_size,
+            seconds_in=seconds_in,
+            seconds_out=seconds_out,
+            elapsed=time.perf_counter() - start,
+            workdir=workdir
+        )
+        
+        if prepared.bytes_out >= bytes_in or seconds_out <= 0:
+            prepared.discard()
+            logger.info("Normalisation audio sans gain, envoi du fichier original")
+            return None
+        
+        logger.info(
+            f"Audio normalisé: {bytes_in - prepared.bytes_out} octets et "
+            f"{seconds_in - seconds_out:.1f}s économisés ({bytes_in} -> {prepared.bytes_out} octets, "
+            f"{seconds_in:.1f}s -> {seconds_out:.1f}s) en {prepared.elapsed:.2f}s"
+        )
+        return prepared
\ No newline at end of file
@@ -0,0 +1,52 @@
+from collections import Counter
+from typing import Optional
+from models.content import ContentType
+from services.claim_parser import ParsedAnalysis
+
+class ModelRouter:
+    def __init__(
+        self,
+        heavy_model: str,
+        fast_model: Optional[str],
+        fast_content_types: list[str],
+        fast_max_text_chars: int,
+        fast_max_media_bytes: int,
+        escalate_on_empty: bool = True
+    ):
+        self.heavy_model = heavy_model
+        self.fast_model = fast_model or None
+        self.fast_content_types = set(fast_content_types)
+        self.fast_max_text_chars = fast_max_text_chars
+        self.fast_max_media_bytes = fast_max_media_bytes
+        self.escalate_on_empty = escalate_on_empty
+        self.calls = Counter()
+        self.escalations = Counter()
+    
+    def pick(self, content_type: ContentType, size: int = 0) -> str:
+        model = self.heavy_model
+        if self.fast_model and content_type.value in self.fast_content_types:
+            limit = self.fast_max_text_chars if content_type in (ContentType.TEXT, ContentType.LINK) else self.fast_max_media_bytes
+            if size <= limit:
+                model = self.fast_model
+        self.calls[model] += 1
+        return model
+    
+    def escalation_reason(self, model: str, parsed: ParsedAnalysis) -> Optional[str]:
+        if model == self.heavy_model:
+            return None
+        if not parsed.ok:
+            return "malformed"
+        if not parsed.claims and self.escalate_on_empty:
+            return "no_claims"
+        return None
+    
+    def record_escalation(self, reason: str):
+        self.escalations[reason] += 1
+        self.calls[self.heavy_model] += 1
+    
+    def stats(self) -> dict:
+        return {
+            "calls": {model.replace("-", "_").replace(".", "_"): count for model, count in self.calls.items()},
+            "escalations": dict(self.escalations),
+            "escalation_rate": sum(self.escalations.values()) / self.calls[self.fast_model] if self.fast_model and self.calls[self.fast_model] else 0.0
+        }
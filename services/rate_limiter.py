@@ -0,0 +1,84 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+from models.content import ContentType
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    retry_after: float = 0.0
+    scope: Optional[str] = None
+
+class TokenBucketLimiter:
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        costs: dict[ContentType, float],
+        max_users: int,
+        global_capacity: float,
+        global_refill_per_second: float
+    ):
+        self.capacity = capacity
+        self.interval = 1.0 / refill_per_second
+        self.costs = costs
+        self.max_users = max_users
+        self.global_capacity = global_capacity
+        self.global_interval = 1.0 / global_refill_per_second
+        self._user_tat: dict[int, float] = {}
+        self._global_tat = 0.0
+        self.allowed = 0
+        self.throttled_user = 0
+        self.throttled_global = 0
+        self.evicted = 0
+    
+    @staticmethod
+    def _check(tat: float, now: float, cost: float, interval: float, capacity: float) -> tuple[float, float]:
+        new_tat = max(tat, now) + cost * interval
+        excess = new_tat - now - capacity * interval
+        return new_tat, excess
+    
+    def acquire(self, user_id: int, content_type: ContentType, now: Optional[float] = None) -> RateLimitDecision:
+        now = time.monotonic() if now is None else now
+        cost = self.costs.get(content_type, 1.0)
+        
+        user_tat, user_excess = self._check(self._user_tat.get(user_id, now), now, cost, self.interval, self.capacity)
+        if user_excess > 0:
+            self.throttled_user += 1
+            return RateLimitDecision(allowed=False, retry_after=user_excess, scope="user")
+        
+        global_tat, global_excess = self._check(self._global_tat, now, cost, self.global_interval, self.global_capacity)
+        if global_excess > 0:
+            self.throttled_global += 1
+            return RateLimitDecision(allowed=False, retry_after=global_excess, scope="global")
+        
+        self._global_tat = global_tat
+        self._user_tat.pop(user_id, None)
+        self._user_tat[user_id] = user_tat
+        self.allowed += 1
+        
+        if len(self._user_tat) > self.max_users:
+            self._evict(now)
+        
+        return RateLimitDecision(allowed=True)
+    
+    def _evict(self, now: float):
+        idle = [user_id for user_id, tat in self._user_tat.items() if tat <= now]
+        for user_id in idle:
+            del self._user_tat[user_id]
+        
+        overflow = len(self._user_tat) - int(self.max_users * 0.9)
+        if overflow > 0:
+            for user_id in list(self._user_tat)[:overflow]:
+                del self._user_tat[user_id]
+        
+        self.evicted += len(idle) + max(overflow, 0)
+    
+    def stats(self) -> dict:
+        return {
+            "tracked_users": len(self._user_tat),
+            "allowed": self.allowed,
+            "throttled_user": self.throttled_user,
+            "throttled_global": self.throttled_global,
+            "evicted": self.evicted
+        }
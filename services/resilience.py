@@ -0,0 +1,182 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, TypeVar
+from utils.logger import logger
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"{upstream} est momentanément indisponible, réessaie dans {retry_after:.0f}s")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.opened = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+    
+    def before_call(self, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        
+        if self.state == OPEN:
+            remaining = self.opened_at + self.recovery_timeout - now
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, remaining)
+            self.state = HALF_OPEN
+            logger.info(f"Disjoncteur {self.name} semi-ouvert, requête de test autorisée")
+        
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.recovery_timeout)
+            self._probe_in_flight = True
+    
+    def release(self):
+        self._probe_in_flight = False
+    
+    def record_success(self):
+        if self.state != CLOSED:
+            logger.info(f"Disjoncteur {self.name} refermé")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+    
+    def record_failure(self, now: Optional[float] = None):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.opened += 1
+                logger.warning(
+                    f"Disjoncteur {self.name} ouvert après {self.consecutive_failures} échecs, "
+                    f"pause de {self.recovery_timeout:.0f}s"
+                )
+            self.state = OPEN
+            self.opened_at = time.monotonic() if now is None else now
+    
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "open": int(self.state == OPEN),
+            "half_open": int(self.state == HALF_OPEN),
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected
+        }
+
+@dataclass
+class RetryPolicy:
+    attempts: int
+    base_delay: float
+    max_delay: float
+    
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+class ResilientCaller:
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        policy: RetryPolicy,
+        is_retryable: Callable[[BaseException], bool],
+        is_upstream_failure: Optional[Callable[[BaseException], bool]] = None
+    ):
+        self.breaker = breaker
+        self.policy = policy
+        self.is_retryable = is_retryable
+        self.is_upstream_failure = is_upstream_failure or is_retryable
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+    
+    async def call(self, operation: Callable[[], Awaitable[T]], hedge_delay: Optional[float] = None) -> T:
+        self.calls += 1
+        attempt = 0
+        
+        while True:
+            self.breaker.before_call()
+            try:
+                result = await self._attempt(operation, hedge_delay)
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            except Exception as e:
+                if not self.is_upstream_failure(e):
+                    self.breaker.release()
+                    self.failures += 1
+                    raise
+                
+                self.breaker.record_failure()
+                attempt += 1
+                if attempt >= self.policy.attempts or not self.is_retryable(e) or self.breaker.state != CLOSED:
+                    self.failures += 1
+                    raise
+                
+                delay = self.policy.backoff(attempt - 1)
+                self.retries += 1
+                logger.warning(
+                    f"{self.breaker.name}: tentative {attempt}/{self.policy.attempts} échouée ({e!r}), "
+                    f"nouvel essai dans {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            
+            self.breaker.record_success()
+            return result
+    
+    async def _attempt(self, operation: Callable[[], Awaitable[T]], hedge_delay: Optional[float]) -> T:
+        if hedge_delay is None:
+            return await operation()
+        
+        primary = asyncio.ensure_future(operation())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if done:
+                return primary.result()
+            
+            self.hedged += 1
+            hedge = asyncio.ensure_future(operation())
+            tasks.add(hedge)
+            error: Optional[BaseException] = None
+            
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def stats(self) -> dict:
+        return {
+            **self.breaker.stats(),
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins
+        }
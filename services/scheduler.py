@@ -0,0 +1,92 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional, Callable, Awaitable
+from models.content import ContentType
+from utils.logger import logger
+
+class SchedulerSaturated(Exception):
+    pass
+
+class _Lane:
+    def __init__(self, limit: int, max_queue: int):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queue_depth": len(self.waiters),
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "avg_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+            "max_wait": self.max_wait
+        }
+
+class AnalysisScheduler:
+    def __init__(self, limits: dict[ContentType, int], max_queue: int):
+        self._lanes = {content_type: _Lane(limit, max_queue) for content_type, limit in limits.items()}
+    
+    @asynccontextmanager
+    async def slot(self, content_type: ContentType, on_queued: Optional[Callable[[int], Awaitable[None]]] = None):
+        lane = self._lanes[content_type]
+        start = time.monotonic()
+        
+        if lane.active < lane.limit and not lane.waiters:
+            lane.active += 1
+        else:
+            if len(lane.waiters) >= lane.max_queue:
+                lane.rejected += 1
+                logger.warning(f"File {content_type.value} saturée ({len(lane.waiters)} en attente), requête rejetée")
+                raise SchedulerSaturated(content_type)
+            
+            waiter = asyncio.get_running_loop().create_future()
+            lane.waiters.append(waiter)
+            lane.queued += 1
+            
+            try:
+                if on_queued:
+                    await on_queued(len(lane.waiters))
+                await waiter
+            except BaseException:
+                if waiter.done() and not waiter.cancelled():
+                    self._release(lane)
+                else:
+                    waiter.cancel()
+                    try:
+                        lane.waiters.remove(waiter)
+                    except ValueError:
+                        pass
+                raise
+        
+        waited = time.monotonic() - start
+        lane.admitted += 1
+        lane.total_wait += waited
+        lane.max_wait = max(lane.max_wait, waited)
+        
+        try:
+            yield waited
+        finally:
+            self._release(lane)
+    
+    def _release(self, lane: _Lane):
+        while lane.waiters:
+            waiter = lane.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        lane.active -= 1
+    
+    def stats(self) -> dict:
+        return {content_type.value: lane.stats() for content_type, lane in self._lanes.items()}
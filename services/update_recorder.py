@@ -0,0 +1,112 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Optional
+from telegram import Update
+from utils.logger import logger
+from utils.validators import extract_urls
+
+MEDIA_FIELDS = ("photo", "video", "voice", "audio", "document", "video_note", "animation", "sticker")
+PLACEHOLDER_PREFIX = "h:"
+
+def pseudonym(value, salt: str) -> str:
+    return hashlib.sha256(f"{salt}:{value}".encode()).hexdigest()[:16]
+
+def pseudonym_id(value: int, salt: str) -> int:
+    return int(pseudonym(value, salt), 16) % 10**12
+
+def redact_text(text: str, salt: str) -> str:
+    if text.startswith("/"):
+        return text.split()[0]
+    urls = extract_urls(text)
+    placeholders = [f"https://replay.invalid/{pseudonym(url, salt)}" for url in urls]
+    filler = max(0, len(text) - sum(len(url) for url in urls) - len(placeholders))
+    return " ".join(["x" * filler, *placeholders]).strip() if filler else " ".join(placeholders)
+
+def _redact_file(media: dict, salt: str) -> dict:
+    placeholder = PLACEHOLDER_PREFIX + pseudonym(media.get("file_unique_id") or media.get("file_id"), salt)
+    redacted = {key: value for key, value in media.items() if key not in ("file_name", "thumbnail", "thumb")}
+    redacted["file_id"] = placeholder
+    redacted["file_unique_id"] = placeholder
+    return redacted
+
+def redact_message(message: dict, salt: str, keep_text: bool) -> dict:
+    message = {key: value for key, value in message.items() if value is not False}
+    
+    if "from" in message:
+        sender = message["from"]
+        message["from"] = {"id": pseudonym_id(sender["id"], salt), "is_bot": sender.get("is_bot", False), "first_name": "Replay"}
+    if "chat" in message:
+        chat = message["chat"]
+        message["chat"] = {"id": pseudonym_id(chat["id"], salt), "type": chat.get("type", "private")}
+    
+    if not keep_text:
+        for key in ("text", "caption"):
+            if key in message:
+                message[key] = redact_text(message[key], salt)
+        message["entities"] = [
+            entity for entity in message.get("entities", [])
+            if entity["type"] == "bot_command" and entity["offset"] == 0
+        ]
+        if not message["entities"]:
+            del message["entities"]
+        message.pop("caption_entities", None)
+    message.pop("reply_to_message", None)
+    
+    for key in MEDIA_FIELDS:
+        if key not in message:
+            continue
+        if isinstance(message[key], list):
+            message[key] = [_redact_file(size, salt) for size in message[key]]
+        else:
+            message[key] = _redact_file(message[key], salt)
+    
+    return message
+
+class UpdateRecorder:
+    def __init__(self, path: Path, salt: str, keep_text: bool = False, flush_every: int = 50):
+        self.path = path
+        self.salt = salt
+        self.keep_text = keep_text
+        self.flush_every = flush_every
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._started = time.monotonic()
+        self._pending = 0
+        self.recorded = 0
+        logger.info(f"Enregistrement des updates dans {path}")
+    
+    def record(self, update: Update):
+        data = update.to_dict()
+        if "message" not in data:
+            return
+        
+        entry = {
+            "t": round(time.monotonic() - self._started, 3),
+            "u": {"update_id": data["update_id"], "message": redact_message(data["message"], self.salt, self.keep_text)}
+        }
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.recorded += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self._file.flush()
+            self._pending = 0
+    
+    def stats(self) -> dict:
+        return {"recorded": self.recorded}
+    
+    def close(self):
+        self._file.close()
+        logger.info(f"{self.recorded} updates enregistrées dans {self.path}")
+
+def load_recording(path: Path, limit: Optional[int] = None) -> list[dict]:
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entries.append(json.loads(line))
+            if limit and len(entries) >= limit:
+                break
+    return entries
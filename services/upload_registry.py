@@ -0,0 +1,77 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+EXPIRY_MARGIN_SECONDS = 600
+
+@dataclass
+class RemoteUpload:
+    file: Any
+    size: int
+    expires_at: float
+    
+    @property
+    def name(self) -> str:
+        return self.file.name
+
+def remote_expiry(file: Any, ttl_seconds: float) -> float:
+    expires_at = time.time() + ttl_seconds
+    expiration_time = getattr(file, "expiration_time", None)
+    if isinstance(expiration_time, datetime):
+        if expiration_time.tzinfo is None:
+            expiration_time = expiration_time.replace(tzinfo=timezone.utc)
+        expires_at = min(expires_at, expiration_time.timestamp() - EXPIRY_MARGIN_SECONDS)
+    return expires_at
+
+class UploadRegistry:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._uploads: OrderedDict[str, RemoteUpload] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_uploaded = 0
+        self.bytes_saved = 0
+    
+    def get(self, content_hash: str) -> tuple[Optional[RemoteUpload], list[RemoteUpload]]:
+        upload = self._uploads.get(content_hash)
+        expired = []
+        
+        if upload and upload.expires_at <= time.time():
+            expired.append(self._uploads.pop(content_hash))
+            upload = None
+        
+        if upload:
+            self._uploads.move_to_end(content_hash)
+            self.hits += 1
+            self.bytes_saved += upload.size
+        else:
+            self.misses += 1
+        
+        return upload, expired
+    
+    def put(self, content_hash: str, file: Any, size: int) -> list[RemoteUpload]:
+        self._uploads[content_hash] = RemoteUpload(file=file, size=size, expires_at=remote_expiry(file, self.ttl_seconds))
+        self._uploads.move_to_end(content_hash)
+        self.bytes_uploaded += size
+        
+        evicted = []
+        while len(self._uploads) > self.max_entries:
+            evicted.append(self._uploads.popitem(last=False)[1])
+        return evicted
+    
+    def drain(self) -> list[RemoteUpload]:
+        uploads = list(self._uploads.values())
+        self._uploads.clear()
+        return uploads
+    
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._uploads),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_uploaded": self.bytes_uploaded,
+            "bytes_saved": self.bytes_saved
+        }
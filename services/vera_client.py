@@ -1,130 +1,394 @@
+import asyncio
 import httpx
 import json
-from typing import Optional
+import logging
+from typing import Optional, Callable, Awaitable
 from config.settings import settings
 from utils.logger import logger
+from utils.formatters import format_claim_verdicts
+from utils.metrics import observe_stage, record_cache, record_error
+from utils.tracing import current_request_id
 from models.content import VeraRequest, VeraResponse
+from services.fact_check_cache import FactCheckCache, normalize_query
+from services.claim_index import ClaimIndex
+from services.resilience import CircuitBreaker, CircuitOpenError, ResilientCaller, RetryPolicy
+
+SSE_DONE = object()
+
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+class VeraUpstreamError(Exception):
+    def __init__(self, status_code: int, body: str):
+        super().__init__(f"Erreur API Vera: {status_code} - {body}")
+        self.status_code = status_code
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, VeraUpstreamError):
+        return True
+    return isinstance(error, httpx.TransportError) and not isinstance(error, httpx.TimeoutException)
+
+def is_upstream_failure(error: BaseException) -> bool:
+    return isinstance(error, (VeraUpstreamError, httpx.TransportError))
+
+def create_vera_resilience() -> ResilientCaller:
+    return ResilientCaller(
+        breaker=CircuitBreaker("Vera", settings.vera_breaker_threshold, settings.vera_breaker_recovery),
+        policy=RetryPolicy(settings.vera_retry_attempts, settings.vera_retry_base_delay, settings.vera_retry_max_delay),
+        is_retryable=is_retryable,
+        is_upstream_failure=is_upstream_failure
+    )
+
+def merge_claim_responses(claims: list[str], responses: list[Optional[VeraResponse]]) -> VeraResponse:
+    succeeded = [response for response in responses if response and response.success]
+    
+    if not succeeded:
+        errors = {response.error_message for response in responses if response and response.error_message}
+        return VeraResponse(
+            success=False,
+            answer="",
+            error_message=" / ".join(sorted(errors)) or "Aucune affirmation n'a pu être vérifiée"
+        )
+    
+    sources = []
+    for response in succeeded:
+        sources.extend(source for source in response.sources if source not in sources)
+    
+    return VeraResponse(
+        success=True,
+        answer=format_claim_verdicts(
+            claims,
+            [response.answer if response and response.success else None for response in responses],
+            [response.error_message if response and not response.success else None for response in responses]
+        ),
+        sources=sources
+    )
+
+def parse_sse_line(line: str):
+    line = line.strip()
+    if not line or line.startswith(':'):
+        return None
+    
+    if line.startswith('data:'):
+        line = line[5:].strip()
+    elif line.startswith(('event:', 'id:', 'retry:')):
+        return None
+    
+    if line == '[DONE]':
+        return SSE_DONE
+    
+    try:
+        chunk = json.loads(line)
+    except json.JSONDecodeError:
+        return line if not line.startswith('{') else None
+    
+    if isinstance(chunk, dict):
+        text = chunk.get('answer') or chunk.get('text') or chunk.get('content') or chunk.get('delta')
+        return str(text) if text else None
+    if isinstance(chunk, str):
+        return chunk
+    return None
 
 class VeraClient:
-    def __init__(self):
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[FactCheckCache] = None,
+        resilience: Optional[ResilientCaller] = None,
+        claim_index: Optional[ClaimIndex] = None
+    ):
         self.api_url = settings.vera_api_url
         self.api_key = settings.vera_api_key
         self.headers = {
             "X-API-Key": self.api_key,
             "Content-Type": "application/json"
         }
+        self.client = http_client or httpx.AsyncClient(
+            timeout=settings.vera_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.vera_max_connections,
+                max_keepalive_connections=settings.vera_max_keepalive_connections,
+                keepalive_expiry=settings.vera_keepalive_expiry
+            ),
+            http2=settings.vera_http2
+        )
+        self.cache = cache
+        self.claim_index = claim_index
+        self.resilience = resilience or create_vera_resilience()
         logger.info(f"VeraClient initialisé avec l'URL: {self.api_url}")
     
-    async def fact_check(self, query: str, user_id: str) -> VeraResponse:
+    async def close(self):
+        await self.client.aclose()
+        if self.cache:
+            self.cache.close()
+        logger.info("VeraClient fermé")
+    
+    def _request_headers(self) -> dict:
+        request_id = current_request_id()
+        if not request_id:
+            return self.headers
+        return {**self.headers, "X-Request-ID": request_id}
+    
+    async def fact_check(
+        self,
+        query: str,
+        user_id: str,
+        on_partial: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> VeraResponse:
+        if self.cache:
+            entry = await self.cache.get_entry(query)
+            record_cache("fact_check", entry is not None)
+            if entry:
+                logger.info(f"Fact-check servi depuis le cache pour user {user_id} (âge {entry.age:.0f}s)", extra={"event": "cache_hit"})
+                return entry.response
+        
+        if self.claim_index and self.cache:
+            match = self.claim_index.find(query)
+            entry = await self.cache.get_entry_by_key(match.key) if match else None
+            record_cache("claim_index", entry is not None)
+            if entry:
+                logger.info(
+                    f"Fact-check servi depuis une affirmation proche pour user {user_id} "
+                    f"(distance {match.distance}, âge {entry.age:.0f}s)",
+                    extra={"event": "cache_hit"}
+                )
+                return entry.response
+        
+        with observe_stage("vera_fact_check"):
+            vera_response = await self._call(query, user_id, on_partial)
+        
+        if not vera_response.success:
+            record_error("vera_fact_check")
+        
+        if self.cache and vera_response.success:
+            await self.cache.set(query, vera_response)
+        if self.claim_index and self.cache and vera_response.success:
+            self.claim_index.add(query, normalize_query(query))
+        
+        return vera_response
+    
+    def _hedge_delay(self, query: str) -> Optional[float]:
+        if settings.vera_hedge_enabled and len(query) <= settings.vera_hedge_max_chars:
+            return settings.vera_hedge_delay
+        return None
+    
+    async def _call(
+        self,
+        query: str,
+        user_id: str,
+        on_partial: Optional[Callable[[str], Awaitable[None]]]
+    ) -> VeraResponse:
+        try:
+            if on_partial and settings.vera_streaming:
+                return await self.resilience.call(lambda: self._stream_request(query, user_id, on_partial))
+            return await self.resilience.call(lambda: self._request(query, user_id), hedge_delay=self._hedge_delay(query))
+        
+        except CircuitOpenError as e:
+            logger.warning(f"Appel Vera refusé pour user {user_id}: {e}")
+            return VeraResponse(
+                success=False,
+                answer="",
+                error_message=str(e)
+            )
+        
+        except VeraUpstreamError as e:
+            logger.error(str(e))
+            return VeraResponse(
+                success=False,
+                answer="",
+                error_message=str(e)
+            )
+        
+        except httpx.TimeoutException:
+            return self._timeout_response()
+        
+        except Exception as e:
+            return self._error_response(e)
+    
+    async def _request(self, query: str, user_id: str) -> VeraResponse:
         payload = {
             "query": query,
             "userId": user_id
         }
         
-        try:
-            async with httpx.AsyncClient(timeout=settings.vera_timeout) as client:
-                response = await client.post(
-                    self.api_url,
-                    json=payload,
-                    headers=self.headers
+        response = await self.client.post(
+            self.api_url,
+            json=payload,
+            headers=self._request_headers()
+        )
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Vera response status: {response.status_code}", extra={"event": "vera_response"})
+            logger.debug(f"Vera response headers: {response.headers}", extra={"event": "vera_response"})
+            logger.debug(f"Vera raw response (first 500 chars): {response.text[:500]}", extra={"event": "vera_response"})
+        
+        if response.status_code == 200:
+            return self._parse_body(response.text.strip(), user_id)
+        
+        if response.status_code in RETRYABLE_STATUSES:
+            raise VeraUpstreamError(response.status_code, response.text)
+        
+        error_msg = f"Erreur API Vera: {response.status_code} - {response.text}"
+        logger.error(error_msg)
+        return VeraResponse(
+            success=False,
+            answer="",
+            error_message=error_msg
+        )
+    
+    async def _stream_request(self, query: str, user_id: str, on_partial: Callable[[str], Awaitable[None]]) -> VeraResponse:
+        payload = {
+            "query": query,
+            "userId": user_id
+        }
+        
+        async with self.client.stream("POST", self.api_url, json=payload, headers=self._request_headers()) as response:
+            logger.debug(f"Vera stream status: {response.status_code}", extra={"event": "vera_response"})
+            
+            if response.status_code != 200:
+                body = (await response.aread()).decode(errors="replace")
+                if response.status_code in RETRYABLE_STATUSES:
+                    raise VeraUpstreamError(response.status_code, body)
+                error_msg = f"Erreur API Vera: {response.status_code} - {body}"
+                logger.error(error_msg)
+                return VeraResponse(
+                    success=False,
+                    answer="",
+                    error_message=error_msg
                 )
+            
+            if "application/json" in response.headers.get("content-type", ""):
+                body = (await response.aread()).decode(errors="replace")
+                return self._parse_body(body.strip(), user_id)
+            
+            answer_parts = []
+            answer_length = 0
+            
+            async for line in response.aiter_lines():
+                text = parse_sse_line(line)
+                if text is SSE_DONE:
+                    break
+                if not text:
+                    continue
                 
-                logger.info(f"Vera response status: {response.status_code}")
-                logger.info(f"Vera response headers: {response.headers}")
-                logger.info(f"Vera raw response (first 500 chars): {response.text[:500]}")
+                answer_parts.append(text)
+                answer_length += len(text)
+                await on_partial("".join(answer_parts))
                 
-                if response.status_code == 200:
-                    response_text = response.text.strip()
-                    
-                    if not response_text:
-                        return VeraResponse(
-                            success=False,
-                            answer="",
-                            error_message="Réponse vide de l'API Vera"
-                        )
-                    
-                    try:
-                        data = json.loads(response_text)
-                        
-                        answer = data.get("answer") or data.get("response") or data.get("message") or data.get("text") or ""
-                        sources = data.get("sources", [])
-                        
-                        if not answer:
-                            answer = str(data)
-                        
-                        logger.info(f"Fact-check réussi pour user {user_id}")
-                        
-                        return VeraResponse(
-                            success=True,
-                            answer=answer,
-                            sources=sources
-                        )
-                    
-                    except json.JSONDecodeError as e:
-                        logger.error(f"JSON decode error: {e}")
-                        logger.error(f"Response text: {response_text[:1000]}")
-                        
-                        lines = response_text.split('\n')
-                        answer_parts = []
-                        
-                        for line in lines:
-                            line = line.strip()
-                            if not line:
-                                continue
-                            
-                            if line.startswith('data: '):
-                                line = line[6:]
-                            
-                            if line == '[DONE]':
-                                continue
-                            
-                            try:
-                                chunk = json.loads(line)
-                                if isinstance(chunk, dict):
-                                    text = chunk.get('answer') or chunk.get('text') or chunk.get('content') or chunk.get('delta')
-                                    if text:
-                                        answer_parts.append(str(text))
-                                elif isinstance(chunk, str):
-                                    answer_parts.append(chunk)
-                            except json.JSONDecodeError:
-                                if line and not line.startswith('{'):
-                                    answer_parts.append(line)
-                        
-                        final_answer = ''.join(answer_parts) if answer_parts else response_text
-                        
-                        return VeraResponse(
-                            success=True,
-                            answer=final_answer,
-                            sources=[]
-                        )
-                else:
-                    error_msg = f"Erreur API Vera: {response.status_code} - {response.text}"
-                    logger.error(error_msg)
-                    return VeraResponse(
-                        success=False,
-                        answer="",
-                        error_message=error_msg
-                    )
-        
-        except httpx.TimeoutException:
-            error_msg = "Timeout de l'API Vera"
-            logger.error(error_msg)
+                if answer_length >= settings.vera_stream_max_chars:
+                    logger.warning(f"Réponse Vera tronquée à {answer_length} caractères pour user {user_id}")
+                    break
+            
+            if not answer_parts:
+                return VeraResponse(
+                    success=False,
+                    answer="",
+                    error_message="Réponse vide de l'API Vera"
+                )
+            
+            logger.info(f"Fact-check (stream) réussi pour user {user_id}", extra={"event": "fact_check_success"})
+            
+            return VeraResponse(
+                success=True,
+                answer="".join(answer_parts),
+                sources=[]
+            )
+    
+    def _parse_body(self, response_text: str, user_id: str) -> VeraResponse:
+        if not response_text:
             return VeraResponse(
                 success=False,
                 answer="",
-                error_message=error_msg
+                error_message="Réponse vide de l'API Vera"
             )
         
-        except Exception as e:
-            error_msg = f"Erreur Vera: {str(e)}"
-            logger.error(error_msg)
-            logger.exception("Stack trace complète:")
+        try:
+            data = json.loads(response_text)
+            
+            answer = data.get("answer") or data.get("response") or data.get("message") or data.get("text") or ""
+            sources = data.get("sources", [])
+            
+            if not answer:
+                answer = str(data)
+            
+            logger.info(f"Fact-check réussi pour user {user_id}", extra={"event": "fact_check_success"})
+            
             return VeraResponse(
-                success=False,
-                answer="",
-                error_message=error_msg
+                success=True,
+                answer=answer,
+                sources=sources
             )
+        
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}")
+            logger.error(f"Response text: {response_text[:1000]}")
+            
+            answer_parts = []
+            
+            for line in response_text.split('\n'):
+                text = parse_sse_line(line)
+                if text and text is not SSE_DONE:
+                    answer_parts.append(text)
+            
+            final_answer = ''.join(answer_parts) if answer_parts else response_text
+            
+            return VeraResponse(
+                success=True,
+                answer=final_answer,
+                sources=[]
+            )
+    
+    def _timeout_response(self) -> VeraResponse:
+        error_msg = "Timeout de l'API Vera"
+        logger.error(error_msg)
+        return VeraResponse(
+            success=False,
+            answer="",
+            error_message=error_msg
+        )
+    
+    def _error_response(self, e: Exception) -> VeraResponse:
+        error_msg = f"Erreur Vera: {str(e)}"
+        logger.error(error_msg)
+        logger.exception("Stack trace complète:")
+        return VeraResponse(
+            success=False,
+            answer="",
+            error_message=error_msg
+        )
+    
+    async def fact_check_claims(
+        self,
+        claims: list[str],
+        user_id: str,
+        on_result: Optional[Callable[[int, VeraResponse], Awaitable[None]]] = None
+    ) -> list[VeraResponse]:
+        semaphore = asyncio.Semaphore(settings.vera_claim_concurrency)
+        
+        async def check(index: int, claim: str) -> VeraResponse:
+            async with semaphore:
+                try:
+                    response = await asyncio.wait_for(
+                        self.fact_check(claim, user_id),
+                        timeout=settings.vera_claim_timeout
+                    )
+                except asyncio.TimeoutError:
+                    self.resilience.breaker.record_failure()
+                    logger.error(f"Timeout Vera sur l'affirmation {index + 1} pour user {user_id}")
+                    response = VeraResponse(
+                        success=False,
+                        answer="",
+                        error_message="Timeout de l'API Vera"
+                    )
+            if on_result:
+                await on_result(index, response)
+            return response
+        
+        return await asyncio.gather(*(check(index, claim) for index, claim in enumerate(claims)))
     
     async def fact_check_multiple(self, claims: list[str], user_id: str) -> VeraResponse:
+        if settings.vera_per_claim and len(claims) > 1:
+            responses = await self.fact_check_claims(claims, user_id)
+            return merge_claim_responses(claims, responses)
+        
         combined_query = "Vérifie ces affirmations:\n" + "\n".join([f"- {claim}" for claim in claims])
         return await self.fact_check(combined_query, user_id)
\ No newline at end of file
@@ -2,12 +2,15 @@ from utils.logger import logger
 from utils.formatters import (
     format_fact_check_response,
     format_error_message,
-    format_processing_message
+    format_processing_message,
+    format_claim_verdicts
 )
+from utils.hashing import sha256_file, sha256_bytes
 from utils.validators import (
     is_valid_url,
     extract_urls,
     validate_file_size,
+    validate_size,
     get_mime_type
 )
 
@@ -16,8 +19,12 @@ __all__ = [
     'format_fact_check_response',
     'format_error_message',
     'format_processing_message',
+    'format_claim_verdicts',
     'is_valid_url',
     'extract_urls',
     'validate_file_size',
-    'get_mime_type'
+    'validate_size',
+    'get_mime_type',
+    'sha256_file',
+    'sha256_bytes'
 ]
\ No newline at end of file
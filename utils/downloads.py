@@ -0,0 +1,115 @@
+import asyncio
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+import uuid
+import httpx
+from telegram import File
+from telegram.error import NetworkError
+from config.settings import settings
+from utils.hashing import sha256_bytes, sha256_file
+from utils.metrics import observe_stage, record_bytes
+from utils.validators import ValidationError, is_valid_url, max_size_bytes, validate_size
+
+CHUNK_SIZE = 64 * 1024
+
+Media = Union[Path, BytesIO]
+
+class DownloadError(Exception):
+    pass
+
+def _download_failed(error: Exception) -> DownloadError:
+    if isinstance(error, httpx.HTTPStatusError):
+        return DownloadError(f"Échec du téléchargement du fichier Telegram (HTTP {error.response.status_code})")
+    return DownloadError(f"Échec du téléchargement du fichier Telegram ({type(error).__name__})")
+
+def _too_large(received: int, max_size_mb: int) -> ValidationError:
+    return ValidationError(f"Fichier trop volumineux: plus de {received / 1024 / 1024:.1f}MB (max: {max_size_mb}MB)")
+
+async def _stream_into(http_client: httpx.AsyncClient, url: str, out: BinaryIO, max_size_mb: int) -> int:
+    budget = max_size_bytes(max_size_mb)
+    received = 0
+    
+    try:
+        async with http_client.stream("GET", url) as response:
+            response.raise_for_status()
+            
+            declared = int(response.headers.get("content-length") or 0)
+            if declared > budget:
+                raise _too_large(declared, max_size_mb)
+            
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                received += len(chunk)
+                if received > budget:
+                    raise _too_large(received, max_size_mb)
+                out.write(chunk)
+    except httpx.HTTPError as e:
+        raise _download_failed(e) from None
+    
+    return received
+
+async def download_file(http_client: httpx.AsyncClient, file: File, destination: Path, max_size_mb: int) -> int:
+    try:
+        if not is_valid_url(file.file_path):
+            await file.download_to_drive(destination)
+            size = destination.stat().st_size
+            validate_size(size, max_size_mb)
+            return size
+        
+        with open(destination, "wb") as out:
+            return await _stream_into(http_client, file.file_path, out, max_size_mb)
+    except (httpx.HTTPError, NetworkError) as e:
+        destination.unlink(missing_ok=True)
+        raise _download_failed(e) from None
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+
+async def download_to_memory(http_client: httpx.AsyncClient, file: File, max_size_mb: int) -> BytesIO:
+    buffer = BytesIO()
+    
+    try:
+        if not is_valid_url(file.file_path):
+            await file.download_to_memory(buffer)
+            validate_size(buffer.tell(), max_size_mb)
+        else:
+            await _stream_into(http_client, file.file_path, buffer, max_size_mb)
+    except (httpx.HTTPError, NetworkError) as e:
+        raise _download_failed(e) from None
+    
+    buffer.seek(0)
+    return buffer
+
+async def download_media(
+    http_client: httpx.AsyncClient,
+    file: File,
+    max_size_mb: int,
+    declared_size: Optional[int],
+    extension: str
+) -> Media:
+    with observe_stage("telegram_download"):
+        if declared_size and declared_size <= max_size_bytes(settings.memory_download_threshold_mb):
+            media = await download_to_memory(http_client, file, max_size_mb)
+        else:
+            media = settings.temp_download_path / f"{uuid.uuid4()}.{extension}"
+            await download_file(http_client, file, media, max_size_mb)
+    
+    record_bytes("download", media_size(media))
+    return media
+
+async def hash_media(media: Media) -> str:
+    with observe_stage("media_hash"):
+        if isinstance(media, Path):
+            return await asyncio.to_thread(sha256_file, media)
+        return sha256_bytes(media.getbuffer())
+
+def media_size(media: Media) -> int:
+    if isinstance(media, Path):
+        return media.stat().st_size
+    return media.getbuffer().nbytes
+
+def discard_media(media: Optional[Media]):
+    if isinstance(media, Path):
+        media.unlink(missing_ok=True)
+    elif isinstance(media, BytesIO):
+        media.close()
@@ -31,6 +31,19 @@ def format_fact_check_response(
     
     return "".join(response_parts)
 
+def format_claim_verdicts(claims: list[str], answers: list[Optional[str]], errors: list[Optional[str]]) -> str:
+    sections = []
+    
+    for index, (claim, answer, error) in enumerate(zip(claims, answers, errors), start=1):
+        if answer is not None:
+            sections.append(f"*{index}. {claim}*\n{answer}")
+        elif error:
+            sections.append(f"*{index}. {claim}*\n⚠️ _Vérification indisponible : {error}_")
+        else:
+            sections.append(f"*{index}. {claim}*\n⏳ _Vérification en cours..._")
+    
+    return "\n\n".join(sections)
+
 def format_error_message(error_type: str, details: Optional[str] = None) -> str:
     errors = {
         "processing_error": "❌ *Erreur de traitement*",
@@ -39,7 +52,10 @@ def format_error_message(error_type: str, details: Optional[str] = None) -> str:
         "no_content": "📭 *Aucun contenu détecté*",
         "no_claims": "🤷 *Aucune affirmation à vérifier*",
         "api_error": "🔌 *Erreur API*",
-        "unsupported_format": "❌ *Format non supporté*"
+        "unsupported_format": "❌ *Format non supporté*",
+        "overloaded": "🚦 *Bot surchargé*",
+        "rate_limited": "🐢 *Doucement !*",
+        "unavailable": "🔧 *Service momentanément indisponible*"
     }
     
     message = errors.get(error_type, "❌ *Erreur inconnue*")
@@ -54,6 +70,9 @@ def format_error_message(error_type: str, details: Optional[str] = None) -> str:
 def format_processing_message(content_type: str) -> str:
     return f"⏳ *Analyse en cours...*\n\n🔄 Traitement du {content_type}..."
 
+def format_queue_message(position: int) -> str:
+    return f"🕒 *En file d'attente...*\n\nTu es en position {position}, ton analyse démarre dès qu'une place se libère."
+
 def truncate_text(text: str, max_length: int = 4000) -> str:
     if len(text) <= max_length:
         return text
@@ -0,0 +1,41 @@
+import asyncio
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, Sequence
+from telegram import PhotoSize
+from utils.downloads import Media
+from utils.logger import logger
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+def check_recompression_available(enabled: bool) -> bool:
+    if enabled and Image is None:
+        logger.warning("IMAGE_RECOMPRESS est activé mais Pillow n'est pas installé, les images seront envoyées telles quelles")
+        return False
+    return enabled
+
+def select_photo_size(photos: Sequence[PhotoSize], target_pixels: int) -> PhotoSize:
+    ordered = sorted(photos, key=lambda photo: photo.width * photo.height)
+    for photo in ordered:
+        if photo.width * photo.height >= target_pixels:
+            return photo
+    return ordered[-1]
+
+def _recompress(data: bytes, max_side: int, quality: int) -> Optional[bytes]:
+    with Image.open(BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        image.thumbnail((max_side, max_side))
+        out = BytesIO()
+        image.save(out, "JPEG", quality=quality, optimize=True)
+    recompressed = out.getvalue()
+    return recompressed if len(recompressed) < len(data) else None
+
+async def recompress_image(media: Media, max_side: int, quality: int) -> Optional[BytesIO]:
+    if Image is None:
+        return None
+    data = await asyncio.to_thread(media.read_bytes) if isinstance(media, Path) else bytes(media.getbuffer())
+    recompressed = await asyncio.to_thread(_recompress, data, max_side, quality)
+    return BytesIO(recompressed) if recompressed else None
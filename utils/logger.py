@@ -1,8 +1,149 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import random
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 from pathlib import Path
+from typing import Optional, TextIO
 from colorlog import ColoredFormatter
 from config.settings import settings
+from utils.tracing import RequestIdFilter
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_EXC_FORMATTER = logging.Formatter()
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage()
+        }
+        event = getattr(record, "event", None)
+        if event:
+            entry["event"] = event
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+def redact_secrets(text: str) -> str:
+    token = settings.telegram_bot_token
+    return text.replace(token, "<token>") if token else text
+
+class SecretFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = redact_secrets(record.getMessage())
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        if record.exc_text:
+            record.exc_text = redact_secrets(record.exc_text)
+        return True
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.dropped = 0
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(getattr(record, "event", None), 1.0)
+        if rate >= 1.0 or record.levelno >= logging.WARNING or random.random() < rate:
+            return True
+        self.dropped += 1
+        return False
+
+class DroppingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def create_file_handler(path: Path) -> logging.Handler:
+    path.parent.mkdir(exist_ok=True, parents=True)
+    if settings.log_rotation == "time":
+        return TimedRotatingFileHandler(
+            path,
+            when=settings.log_rotation_when,
+            backupCount=settings.log_backup_count,
+            encoding="utf-8"
+        )
+    if settings.log_rotation == "size":
+        return RotatingFileHandler(
+            path,
+            maxBytes=settings.log_max_bytes,
+            backupCount=settings.log_backup_count,
+            encoding="utf-8"
+        )
+    return logging.FileHandler(path, encoding="utf-8")
+
+def create_handlers(path: Path, stream: Optional[TextIO] = None) -> list[logging.Handler]:
+    console_handler = logging.StreamHandler(stream or sys.stdout)
+    console_handler.setLevel(logging.DEBUG)
+    
+    file_handler = create_file_handler(path)
+    file_handler.setLevel(logging.INFO)
+    
+    if settings.log_format == "json":
+        console_handler.setFormatter(JsonFormatter())
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        console_handler.setFormatter(ColoredFormatter(
+            "%(log_color)s%(asctime)s - %(name)s - %(levelname)s%(reset)s - [%(request_id)s] %(message)s",
+            datefmt=DATE_FORMAT,
+            log_colors={
+                'DEBUG': 'cyan',
+                'INFO': 'green',
+                'WARNING': 'yellow',
+                'ERROR': 'red',
+                'CRITICAL': 'red,bg_white',
+            }
+        ))
+        file_handler.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT))
+    
+    return [console_handler, file_handler]
+
+def attach_handlers(logger: logging.Logger, handlers: list[logging.Handler], queued: bool) -> Optional[QueueListener]:
+    logger.addFilter(RequestIdFilter())
+    logger.addFilter(SecretFilter())
+    logger.addFilter(SamplingFilter(settings.log_sample_rates))
+    
+    if not queued:
+        for handler in handlers:
+            logger.addHandler(handler)
+        return None
+    
+    queue_handler = DroppingQueueHandler(queue.Queue(settings.log_queue_size))
+    logger.addHandler(queue_handler)
+    
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
 
 def setup_logger(name: str = "telegram_bot") -> logging.Logger:
     logger = logging.getLogger(name)
@@ -11,35 +152,19 @@ def setup_logger(name: str = "telegram_bot") -> logging.Logger:
     if logger.handlers:
         return logger
     
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.DEBUG)
-    
-    console_formatter = ColoredFormatter(
-        "%(log_color)s%(asctime)s - %(name)s - %(levelname)s%(reset)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        log_colors={
-            'DEBUG': 'cyan',
-            'INFO': 'green',
-            'WARNING': 'yellow',
-            'ERROR': 'red',
-            'CRITICAL': 'red,bg_white',
-        }
-    )
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    file_handler = logging.FileHandler(log_dir / "bot.log", encoding='utf-8')
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    listener = attach_handlers(logger, create_handlers(settings.log_file_path), settings.log_queue_enabled)
+    if listener:
+        atexit.register(listener.stop)
     
     return logger
 
-logger = setup_logger()
\ No newline at end of file
+def log_stats(target: Optional[logging.Logger] = None) -> dict:
+    target = target or logger
+    queues = [handler for handler in target.handlers if isinstance(handler, DroppingQueueHandler)]
+    return {
+        "queue_depth": sum(handler.queue.qsize() for handler in queues),
+        "queue_dropped": sum(handler.dropped for handler in queues),
+        "sampled_out": sum(f.dropped for f in target.filters if isinstance(f, SamplingFilter))
+    }
+
+logger = setup_logger()
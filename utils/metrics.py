@@ -0,0 +1,135 @@
+import asyncio
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+from prometheus_client import Counter, Histogram, REGISTRY, start_http_server
+from prometheus_client.core import GaugeMetricFamily
+from utils.tracing import span
+
+current_content_type: ContextVar[str] = ContextVar("current_content_type", default="inconnu")
+
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+
+STAGE_LATENCY = Histogram(
+    "factcheck_stage_duration_seconds",
+    "Durée de chaque étape du pipeline de fact-checking",
+    ["stage", "content_type"],
+    buckets=STAGE_BUCKETS
+)
+STAGE_ERRORS = Counter(
+    "factcheck_stage_errors_total",
+    "Erreurs levées par étape du pipeline",
+    ["stage", "content_type"]
+)
+REQUESTS = Counter(
+    "factcheck_requests_total",
+    "Messages reçus par type de contenu",
+    ["content_type"]
+)
+CACHE_EVENTS = Counter(
+    "factcheck_cache_events_total",
+    "Succès et échecs des caches",
+    ["cache", "result"]
+)
+GEMINI_MODEL_LATENCY = Histogram(
+    "factcheck_gemini_model_duration_seconds",
+    "Durée des appels Gemini par modèle et résultat",
+    ["model", "content_type", "outcome"],
+    buckets=STAGE_BUCKETS
+)
+GEMINI_ESCALATIONS = Counter(
+    "factcheck_gemini_escalations_total",
+    "Requêtes relancées sur le modèle lourd",
+    ["content_type", "reason"]
+)
+BYTES_TRANSFERRED = Counter(
+    "factcheck_bytes_total",
+    "Octets téléchargés depuis Telegram ou envoyés à Gemini",
+    ["direction", "content_type"]
+)
+
+@contextmanager
+def observe_stage(stage: str, content_type: Optional[str] = None):
+    content_type = content_type or current_content_type.get()
+    start = time.perf_counter()
+    try:
+        with span(stage):
+            yield
+    except Exception:
+        STAGE_ERRORS.labels(stage, content_type).inc()
+        raise
+    finally:
+        STAGE_LATENCY.labels(stage, content_type).observe(time.perf_counter() - start)
+
+def record_error(stage: str, content_type: Optional[str] = None):
+    STAGE_ERRORS.labels(stage, content_type or current_content_type.get()).inc()
+
+def record_cache(cache: str, hit: bool):
+    CACHE_EVENTS.labels(cache, "hit" if hit else "miss").inc()
+
+def record_bytes(direction: str, size: int, content_type: Optional[str] = None):
+    BYTES_TRANSFERRED.labels(direction, content_type or current_content_type.get()).inc(size)
+
+class StatsCollector:
+    def __init__(self, sources: dict[str, Callable[[], dict]], loop: asyncio.AbstractEventLoop, timeout: float = 2.0):
+        self.sources = sources
+        self.loop = loop
+        self.timeout = timeout
+        self.snapshot: tuple[tuple[str, str, float], ...] = ()
+    
+    def take_snapshot(self) -> tuple[tuple[str, str, float], ...]:
+        return tuple(
+            (component, name, value)
+            for component, stats in self.sources.items()
+            for name, value in _flatten(stats())
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        )
+    
+    def refresh(self) -> tuple[tuple[str, str, float], ...]:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self.snapshot = self.take_snapshot()
+            return self.snapshot
+        
+        future: Future = Future()
+        
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(self.take_snapshot())
+            except Exception as e:
+                future.set_exception(e)
+        
+        try:
+            self.loop.call_soon_threadsafe(run)
+            self.snapshot = future.result(self.timeout)
+        except (RuntimeError, TimeoutError):
+            future.cancel()
+        return self.snapshot
+    
+    def collect(self):
+        for component, name, value in self.refresh():
+            gauge = GaugeMetricFamily(
+                f"factcheck_{component}_{name}",
+                f"Statistique {name} de {component}"
+            )
+            gauge.add_metric([], value)
+            yield gauge
+
+def _flatten(stats: dict, prefix: str = ""):
+    for key, value in stats.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{name}_")
+        else:
+            yield name, value
+
+def start_metrics_server(port: int, addr: str, sources: dict[str, Callable[[], dict]], loop: asyncio.AbstractEventLoop):
+    REGISTRY.register(StatsCollector(sources, loop))
+    start_http_server(port, addr=addr)
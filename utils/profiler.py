@@ -0,0 +1,69 @@
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+from utils.logger import logger
+
+class SamplingProfiler:
+    def __init__(self, interval: float, dump_interval: float, output_path: Path, max_depth: int = 40):
+        self.interval = interval
+        self.dump_interval = dump_interval
+        self.output_path = output_path
+        self.max_depth = max_depth
+        self.samples: Counter[str] = Counter()
+        self._target_thread: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self, thread_id: Optional[int] = None):
+        self._target_thread = thread_id or threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"Profiler par échantillonnage démarré ({self.interval * 1000:.0f}ms)")
+    
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.dump()
+    
+    def _sample(self):
+        frame = sys._current_frames().get(self._target_thread)
+        stack = []
+        while frame and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append(f"{Path(code.co_filename).name}:{code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        if stack:
+            self.samples[";".join(reversed(stack))] += 1
+    
+    def _run(self):
+        next_dump = time.monotonic() + self.dump_interval
+        while not self._stop.wait(self.interval):
+            self._sample()
+            if time.monotonic() >= next_dump:
+                self.dump()
+                next_dump = time.monotonic() + self.dump_interval
+    
+    def top_functions(self, limit: int = 10) -> list[tuple[str, int]]:
+        leaves = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(limit)
+    
+    def dump(self):
+        samples = dict(self.samples)
+        if not samples:
+            return
+        self.output_path.parent.mkdir(exist_ok=True, parents=True)
+        with open(self.output_path, "w", encoding="utf-8") as f:
+            for stack, count in samples.items():
+                f.write(f"{stack} {count}\n")
+        total = sum(samples.values())
+        top = ", ".join(f"{name} {count / total:.0%}" for name, count in self.top_functions(5))
+        logger.info(f"Profil CPU ({total} échantillons) écrit dans {self.output_path}: {top}")
@@ -0,0 +1,47 @@
+import asyncio
+import time
+from typing import Optional
+from telegram import Message
+from telegram.error import TelegramError
+from utils.formatters import truncate_text
+from utils.logger import logger
+
+class ProgressiveEditor:
+    def __init__(self, message: Message, min_interval: float, header: str = "", parse_mode: Optional[str] = None):
+        self.message = message
+        self.min_interval = min_interval
+        self.header = header
+        self.parse_mode = parse_mode
+        self.edits = 0
+        self._latest: Optional[str] = None
+        self._shown: Optional[str] = None
+        self._last_edit = 0.0
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def update(self, text: str):
+        self._latest = text
+        if self._flush_task is None or self._flush_task.done():
+            delay = max(0.0, self._last_edit + self.min_interval - time.monotonic())
+            self._flush_task = asyncio.create_task(self._flush_after(delay))
+    
+    async def _flush_after(self, delay: float):
+        if delay:
+            await asyncio.sleep(delay)
+        text = self._latest
+        if text is None or text == self._shown:
+            return
+        self._last_edit = time.monotonic()
+        try:
+            await self.message.edit_text(truncate_text(self.header + text), parse_mode=self.parse_mode)
+            self._shown = text
+            self.edits += 1
+        except TelegramError as e:
+            logger.debug(f"Édition progressive ignorée: {e}")
+    
+    async def close(self):
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,64 @@
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+@dataclass
+class Span:
+    name: str
+    offset: float
+    duration: float
+    error: bool = False
+
+@dataclass
+class RequestContext:
+    update_id: Optional[int] = None
+    user_id: Optional[str] = None
+    content_type: Optional[str] = None
+    request_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    started: float = field(default_factory=time.perf_counter)
+    spans: list[Span] = field(default_factory=list)
+    
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+    
+    def breakdown(self) -> str:
+        parts = [
+            f"{span.name} +{span.offset:.2f}s {span.duration:.2f}s{' (erreur)' if span.error else ''}"
+            for span in sorted(self.spans, key=lambda span: span.offset)
+        ]
+        return " | ".join(parts) or "aucune étape enregistrée"
+
+current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+@contextmanager
+def span(name: str):
+    context = current_request.get()
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        if context:
+            context.spans.append(Span(name, start - context.started, time.perf_counter() - start, error))
+
+def record_span(name: str, duration: float, error: bool = False):
+    context = current_request.get()
+    if context:
+        context.spans.append(Span(name, context.elapsed - duration, duration, error))
+
+def current_request_id() -> Optional[str]:
+    context = current_request.get()
+    return context.request_id if context else None
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = current_request_id() or "-"
+        return True
@@ -2,6 +2,7 @@ import re
 import mimetypes
 from urllib.parse import urlparse
 from pathlib import Path
+from typing import Optional
 from config.settings import settings
 
 class ValidationError(Exception):
@@ -19,18 +20,23 @@ def extract_urls(text: str) -> list[str]:
     urls = re.findall(url_pattern, text)
     return [url for url in urls if is_valid_url(url)]
 
-def validate_file_size(file_path: Path, max_size_mb: int = None) -> bool:
+def max_size_bytes(max_size_mb: int = None) -> int:
+    if max_size_mb is None:
+        max_size_mb = settings.max_file_size_mb
+    return max_size_mb * 1024 * 1024
+
+def validate_size(file_size: Optional[int], max_size_mb: int = None) -> bool:
     if max_size_mb is None:
         max_size_mb = settings.max_file_size_mb
     
-    file_size = file_path.stat().st_size
-    max_size_bytes = max_size_mb * 1024 * 1024
-    
-    if file_size > max_size_bytes:
+    if file_size and file_size > max_size_bytes(max_size_mb):
         raise ValidationError(f"Fichier trop volumineux: {file_size / 1024 / 1024:.1f}MB (max: {max_size_mb}MB)")
     
     return True
 
+def validate_file_size(file_path: Path, max_size_mb: int = None) -> bool:
+    return validate_size(file_path.stat().st_size, max_size_mb)
+
 def get_mime_type(file_path: Path) -> str:
     mime_type, _ = mimetypes.guess_type(str(file_path))
     